@@ -1,6 +1,7 @@
 """
 Authentication endpoints.
 """
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
@@ -34,7 +35,7 @@ async def login(
         )
     
     # Verify password
-    if not verify_password(login_data.mot_de_passe, user.mot_de_passe_hash):
+    if not await anyio.to_thread.run_sync(verify_password, login_data.mot_de_passe, user.mot_de_passe_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
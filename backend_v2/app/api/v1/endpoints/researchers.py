@@ -95,10 +95,11 @@ async def list_researchers(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
+    after_id: Optional[int] = None,
     session: AsyncSession = Depends(get_session)
 ):
     """Get all researchers with optional search."""
-    return await ResearcherService.get_all_researchers(session, skip, limit, search)
+    return await ResearcherService.get_all_researchers(session, skip, limit, search, after_id)
 
 
 # Temporarily disabled for light build
@@ -3,6 +3,7 @@ Database connection and session management.
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+import sqlalchemy as sa
 from typing import AsyncGenerator
 from ..core.config import settings
 
@@ -10,7 +11,9 @@ from ..core.config import settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=True,
-    future=True
+    future=True,
+    # Keep hot queries prepared per connection (SQLAlchemy adapter + asyncpg caches)
+    connect_args={"prepared_statement_cache_size": 512, "statement_cache_size": 1024}
 )
 
 # Create async session factory
@@ -24,6 +27,33 @@ async_session = async_sessionmaker(
 Base = declarative_base()
 
 
+# Databases created before cles_api.utilisateur_id was declared UNIQUE lack the constraint
+# that the API-key upsert's ON CONFLICT needs, and create_all never alters existing tables.
+# It is added at startup when that is lossless; otherwise startup fails and points at the dedupe script.
+_CLES_API_UNIQUE_USER_SQL = sa.text("""
+DO $$
+BEGIN
+    -- Serialize concurrent workers running the same startup check
+    PERFORM pg_advisory_xact_lock(hashtext('cles_api_utilisateur_id_key'));
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'cles_api'::regclass AND i.indisunique AND i.indnatts = 1
+          AND i.indpred IS NULL AND a.attname = 'utilisateur_id'
+    ) THEN
+        -- Never delete stored keys from here; duplicates are merged by an explicit one-off script
+        IF EXISTS (
+            SELECT 1 FROM cles_api WHERE utilisateur_id IS NOT NULL
+            GROUP BY utilisateur_id HAVING count(*) > 1
+        ) THEN
+            RAISE EXCEPTION 'cles_api holds several rows for some utilisateur_id, so UNIQUE (utilisateur_id) cannot be added. Run init-scripts/03-dedupe-cles-api.sql once, then restart.';
+        END IF;
+        ALTER TABLE cles_api ADD CONSTRAINT cles_api_utilisateur_id_key UNIQUE (utilisateur_id);
+    END IF;
+END $$
+""")
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
     async with async_session() as session:
@@ -39,6 +69,7 @@ async def init_db() -> None:
         # Import all models here to ensure they are registered
         from ..models import user, researcher, api_key, database_config, access_base
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(_CLES_API_UNIQUE_USER_SQL)
 
 
 async def close_db() -> None:
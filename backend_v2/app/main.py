@@ -47,8 +47,9 @@ def create_application() -> FastAPI:
         allow_origins=settings.BACKEND_CORS_ORIGINS,
         allow_origin_regex=".*",
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+        allow_headers=["Authorization", "Content-Type"],
+        max_age=86400,  # Let browsers cache preflight responses for a day
     )
 
     # Include API router
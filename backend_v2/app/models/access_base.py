@@ -1,7 +1,7 @@
 """
 Database access model definitions.
 """
-from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import String, BigInteger, ForeignKey, DateTime
 import sqlalchemy as sa
 from datetime import datetime
@@ -17,3 +17,6 @@ class AccesBase(Base):
     configuration_base_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("configurations_bases.id"))
     niveau_acces: Mapped[str] = mapped_column(String(20))
     date_creation: Mapped[datetime] = mapped_column(DateTime, server_default=sa.func.now())
+
+    utilisateur: Mapped["Utilisateur"] = relationship(back_populates="acces_bases", lazy="raise")
+    configuration_base: Mapped["ConfigurationBase"] = relationship(back_populates="acces_bases", lazy="raise")
@@ -1,7 +1,7 @@
 """
 API Key model definitions.
 """
-from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import Text, BigInteger, ForeignKey
 from typing import Optional
 from ..db.database import Base
@@ -12,9 +12,11 @@ class CleApi(Base):
     __tablename__ = "cles_api"
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    utilisateur_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("utilisateurs.id", ondelete="CASCADE"))
+    utilisateur_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("utilisateurs.id", ondelete="CASCADE"), unique=True)
     cle_openai: Mapped[Optional[str]] = mapped_column(Text)
     cle_gemini: Mapped[Optional[str]] = mapped_column(Text)
     cle_claude: Mapped[Optional[str]] = mapped_column(Text)
     cle_deepseek: Mapped[Optional[str]] = mapped_column(Text)
     cle_scopus: Mapped[Optional[str]] = mapped_column(Text)
+
+    utilisateur: Mapped["Utilisateur"] = relationship(back_populates="cles_api", lazy="raise")
@@ -1,11 +1,11 @@
 """
 Database configuration model definitions.
 """
-from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import String, Text, Boolean, BigInteger, DateTime
 import sqlalchemy as sa
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from ..db.database import Base
 
 
@@ -20,3 +20,5 @@ class ConfigurationBase(Base):
     parametres_connexion: Mapped[Optional[str]] = mapped_column(Text)
     est_active: Mapped[bool] = mapped_column(Boolean, default=True)
     date_creation: Mapped[datetime] = mapped_column(DateTime, server_default=sa.func.now())
+
+    acces_bases: Mapped[List["AccesBase"]] = relationship(back_populates="configuration_base", lazy="raise", passive_deletes=True)
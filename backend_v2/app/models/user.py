@@ -1,11 +1,11 @@
 """
 User model definitions.
 """
-from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import String, Text, Boolean, BigInteger, DateTime
 import sqlalchemy as sa
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from ..db.database import Base
 
 
@@ -23,3 +23,7 @@ class Utilisateur(Base):
     est_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     telephone: Mapped[Optional[str]] = mapped_column(String(20))
     est_actif: Mapped[bool] = mapped_column("est_actif", Boolean, default=True)
+
+    # lazy="raise" surfaces accidental N+1 loads; use selectinload() when these are needed
+    cles_api: Mapped[List["CleApi"]] = relationship(back_populates="utilisateur", lazy="raise", passive_deletes=True)
+    acces_bases: Mapped[List["AccesBase"]] = relationship(back_populates="utilisateur", lazy="raise", passive_deletes=True)
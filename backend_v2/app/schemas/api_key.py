@@ -1,7 +1,7 @@
 """
 API Key Pydantic schemas.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
@@ -29,5 +29,4 @@ class CleApiRead(CleApiBase):
     id: int
     utilisateur_id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
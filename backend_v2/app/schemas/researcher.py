@@ -1,7 +1,7 @@
 """
 Researcher Pydantic schemas.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
@@ -24,5 +24,4 @@ class ChercheurRead(ChercheurBase):
     """Schema for reading researcher data."""
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
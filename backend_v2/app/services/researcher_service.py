@@ -2,13 +2,23 @@
 Researcher service layer for business logic.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, func, literal_column
 from fastapi import HTTPException, status
 from typing import List, Optional, Dict, Any
 
 from ..models.researcher import Chercheur
 from ..schemas.researcher import ChercheurCreate
 
+# Concatenated search text; must match the ix_chercheurs_search trigram index expression
+_SEP = literal_column("' '")
+_SEARCH_TEXT = (
+    func.coalesce(Chercheur.nom, literal_column("''")) + _SEP
+    + func.coalesce(Chercheur.prenom, literal_column("''")) + _SEP
+    + func.coalesce(Chercheur.affiliation, literal_column("''")) + _SEP
+    + func.coalesce(Chercheur.orcid_id, literal_column("''")) + _SEP
+    + func.coalesce(Chercheur.domaines_recherche, literal_column("''")) + _SEP
+    + func.coalesce(Chercheur.mots_cles_specifiques, literal_column("''"))
+)
 
 class ResearcherService:
     """Researcher service class."""
@@ -32,7 +42,7 @@ class ResearcherService:
                 )
         
         # Truncate affiliation to 255 characters if it's too long
-        researcher_dict = researcher_data.dict()
+        researcher_dict = researcher_data.model_dump()
         if researcher_dict.get("affiliation") and len(researcher_dict["affiliation"]) > 255:
             researcher_dict["affiliation"] = researcher_dict["affiliation"][:255]
         
@@ -66,26 +76,22 @@ class ResearcherService:
         session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after_id: Optional[int] = None
     ) -> List[Chercheur]:
-        """Get all researchers with optional search."""
+        """Get all researchers with optional search, ordered by id.
+        
+        Pass the last id of the previous page as after_id for keyset paging."""
         query = select(Chercheur)
         
-        # Add search functionality across all fields
+        # Add search functionality across all fields (served by the pg_trgm GIN index)
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    Chercheur.nom.ilike(search_term),
-                    Chercheur.prenom.ilike(search_term),
-                    Chercheur.affiliation.ilike(search_term),
-                    Chercheur.orcid_id.ilike(search_term),
-                    Chercheur.domaines_recherche.ilike(search_term),
-                    Chercheur.mots_cles_specifiques.ilike(search_term)
-                )
-            )
+            query = query.where(_SEARCH_TEXT.ilike(f"%{search}%"))
+        if after_id is not None:
+            query = query.where(Chercheur.id > after_id)
         
-        query = query.offset(skip).limit(limit)
+        # A stable order so consecutive pages neither repeat nor skip rows
+        query = query.order_by(Chercheur.id).offset(skip).limit(limit)
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -96,7 +102,7 @@ class ResearcherService:
         researcher_data: ChercheurCreate
     ) -> Chercheur:
         """Update an existing researcher."""
-        researcher_dict = researcher_data.dict()
+        researcher_dict = researcher_data.model_dump()
         
         # Truncate affiliation to 255 characters if it's too long
         if researcher_dict.get("affiliation") and len(researcher_dict["affiliation"]) > 255:
@@ -1,10 +1,10 @@
 """
 User service layer for business logic.
 """
+import anyio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, update, func
 from fastapi import HTTPException, status
-from datetime import datetime
 from typing import List, Optional
 
 from ..models.user import Utilisateur
@@ -23,16 +23,16 @@ class UserService:
         """Create a new user."""
         # Check if email exists
         result = await session.execute(
-            select(Utilisateur).where(Utilisateur.email == user_data.email)
+            select(exists().where(Utilisateur.email == user_data.email))
         )
-        if result.scalar_one_or_none():
+        if result.scalar():
             raise HTTPException(
                 status_code=400, 
                 detail="Email already registered"
             )
         
         # Create user with bcrypt hash
-        hashed_password = get_password_hash(user_data.mot_de_passe)
+        hashed_password = await anyio.to_thread.run_sync(get_password_hash, user_data.mot_de_passe)
         db_user = Utilisateur(
             nom=user_data.nom,
             prenom=user_data.prenom,
@@ -74,6 +74,24 @@ class UserService:
         result = await session.execute(select(Utilisateur))
         return result.scalars().all()
     
+    @staticmethod
+    async def _update_user(
+        session: AsyncSession,
+        user: Utilisateur,
+        **values
+    ) -> Utilisateur:
+        """Apply column updates in one UPDATE ... RETURNING, stamping date_modification server-side."""
+        result = await session.execute(
+            update(Utilisateur)
+            .where(Utilisateur.id == user.id)
+            .values(**values, date_modification=func.now())
+            .returning(Utilisateur)
+            .execution_options(populate_existing=True)
+        )
+        updated_user = result.scalar_one()
+        await session.commit()
+        return updated_user
+    
     @staticmethod
     async def update_user_profile(
         session: AsyncSession,
@@ -93,15 +111,14 @@ class UserService:
                 )
         
         # Update user profile
-        user.nom = profile_data.nom
-        user.prenom = profile_data.prenom
-        user.email = profile_data.email
-        user.telephone = profile_data.telephone
-        user.date_modification = datetime.utcnow()
-        
-        await session.commit()
-        await session.refresh(user)
-        return user
+        return await UserService._update_user(
+            session,
+            user,
+            nom=profile_data.nom,
+            prenom=profile_data.prenom,
+            email=profile_data.email,
+            telephone=profile_data.telephone
+        )
     
     @staticmethod
     async def update_user_status(
@@ -118,12 +135,7 @@ class UserService:
                 detail="Cannot modify your own status"
             )
         
-        user.est_actif = status_data.est_actif
-        user.date_modification = datetime.utcnow()
-        
-        await session.commit()
-        await session.refresh(user)
-        return user
+        return await UserService._update_user(session, user, est_actif=status_data.est_actif)
     
     @staticmethod
     async def update_user_admin(
@@ -140,12 +152,7 @@ class UserService:
                 detail="Cannot modify your own admin status"
             )
         
-        user.est_admin = admin_data.est_admin
-        user.date_modification = datetime.utcnow()
-        
-        await session.commit()
-        await session.refresh(user)
-        return user
+        return await UserService._update_user(session, user, est_admin=admin_data.est_admin)
     
     @staticmethod
     async def change_password(
@@ -156,20 +163,17 @@ class UserService:
     ) -> None:
         """Change user password."""
         # Verify old password
-        if not verify_password(old_password, user.mot_de_passe_hash):
+        if not await anyio.to_thread.run_sync(verify_password, old_password, user.mot_de_passe_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
         # Hash new password
-        new_password_hash = get_password_hash(new_password)
+        new_password_hash = await anyio.to_thread.run_sync(get_password_hash, new_password)
         
         # Update password in database
-        user.mot_de_passe_hash = new_password_hash
-        user.date_modification = datetime.utcnow()
-        
-        await session.commit()
+        await UserService._update_user(session, user, mot_de_passe_hash=new_password_hash)
     
     @staticmethod
     async def delete_user(
@@ -1,17 +1,23 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import Optional, List, AsyncGenerator
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, AsyncGenerator, Iterator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base, mapped_column, Mapped
+from sqlalchemy.orm import declarative_base, mapped_column, Mapped, relationship
 from sqlalchemy import String, Text, Boolean, Integer, BigInteger, ForeignKey, DateTime
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import anyio
+import orjson
 import os
+import re
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -30,10 +36,41 @@ security = HTTPBearer()
 
 DATABASE_URL = "postgresql+asyncpg://postgres:a@localhost:5432/results"
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=True,
+    # Keep hot queries prepared per connection (SQLAlchemy adapter + asyncpg caches)
+    connect_args={"prepared_statement_cache_size": 512, "statement_cache_size": 1024}
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
+# Databases created before cles_api.utilisateur_id was declared UNIQUE lack the constraint
+# that the API-key upsert's ON CONFLICT needs, and create_all never alters existing tables.
+# It is added at startup when that is lossless; otherwise startup fails and points at the dedupe script.
+_CLES_API_UNIQUE_USER_SQL = sa.text("""
+DO $$
+BEGIN
+    -- Serialize concurrent workers running the same startup check
+    PERFORM pg_advisory_xact_lock(hashtext('cles_api_utilisateur_id_key'));
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'cles_api'::regclass AND i.indisunique AND i.indnatts = 1
+          AND i.indpred IS NULL AND a.attname = 'utilisateur_id'
+    ) THEN
+        -- Never delete stored keys from here; duplicates are merged by an explicit one-off script
+        IF EXISTS (
+            SELECT 1 FROM cles_api WHERE utilisateur_id IS NOT NULL
+            GROUP BY utilisateur_id HAVING count(*) > 1
+        ) THEN
+            RAISE EXCEPTION 'cles_api holds several rows for some utilisateur_id, so UNIQUE (utilisateur_id) cannot be added. Run init-scripts/03-dedupe-cles-api.sql once, then restart.';
+        END IF;
+        ALTER TABLE cles_api ADD CONSTRAINT cles_api_utilisateur_id_key UNIQUE (utilisateur_id);
+    END IF;
+END $$
+""")
+
 # Gestionnaire de cycle de vie
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -41,6 +78,7 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         # Cette méthode ne crée que les tables qui n'existent pas déjà
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(_CLES_API_UNIQUE_USER_SQL)
     print("✅ Database connection established and tables verified!")
     yield
     # Shutdown
@@ -50,7 +88,8 @@ app = FastAPI(
     title="Research Database API",
     description="API moderne pour la gestion de la base de données de recherche",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -58,8 +97,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Frontend URLs
     allow_credentials=True,
-    allow_methods=["*"],  # Allow all HTTP methods
-    allow_headers=["*"],  # Allow all headers
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # -----------------------------
@@ -79,6 +119,10 @@ class Utilisateur(Base):
     telephone: Mapped[Optional[str]] = mapped_column(String(20))
     est_actif: Mapped[bool] = mapped_column("est_actif", Boolean, default=True)
 
+    # lazy="raise" surfaces accidental N+1 loads; use selectinload() when these are needed
+    cles_api: Mapped[List["CleApi"]] = relationship(back_populates="utilisateur", lazy="raise", passive_deletes=True)
+    acces_bases: Mapped[List["AccesBase"]] = relationship(back_populates="utilisateur", lazy="raise", passive_deletes=True)
+
 class Chercheur(Base):
     __tablename__ = "chercheurs"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -92,13 +136,15 @@ class Chercheur(Base):
 class CleApi(Base):
     __tablename__ = "cles_api"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    utilisateur_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("utilisateurs.id", ondelete="CASCADE"))
+    utilisateur_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("utilisateurs.id", ondelete="CASCADE"), unique=True)
     cle_openai: Mapped[Optional[str]] = mapped_column(Text)
     cle_gemini: Mapped[Optional[str]] = mapped_column(Text)
     cle_claude: Mapped[Optional[str]] = mapped_column(Text)
     cle_deepseek: Mapped[Optional[str]] = mapped_column(Text)
     cle_scopus: Mapped[Optional[str]] = mapped_column(Text)
 
+    utilisateur: Mapped["Utilisateur"] = relationship(back_populates="cles_api", lazy="raise")
+
 class ConfigurationBase(Base):
     __tablename__ = "configurations_bases"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -109,6 +155,8 @@ class ConfigurationBase(Base):
     est_active: Mapped[bool] = mapped_column(Boolean, default=True)
     date_creation: Mapped[datetime] = mapped_column(DateTime, server_default=sa.func.now())
 
+    acces_bases: Mapped[List["AccesBase"]] = relationship(back_populates="configuration_base", lazy="raise", passive_deletes=True)
+
 class AccesBase(Base):
     __tablename__ = "acces_bases"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -117,6 +165,32 @@ class AccesBase(Base):
     niveau_acces: Mapped[str] = mapped_column(String(20))
     date_creation: Mapped[datetime] = mapped_column(DateTime, server_default=sa.func.now())
 
+    utilisateur: Mapped["Utilisateur"] = relationship(back_populates="acces_bases", lazy="raise")
+    configuration_base: Mapped["ConfigurationBase"] = relationship(back_populates="acces_bases", lazy="raise")
+
+# -----------------------------
+# CACHED STATEMENTS
+# -----------------------------
+
+# Hot lookups built once as lambda statements so SQLAlchemy caches the compiled SQL
+_user_by_email = sa.lambda_stmt(
+    lambda: sa.select(Utilisateur).where(Utilisateur.email == sa.bindparam("email"))
+)
+_chercheur_by_orcid = sa.lambda_stmt(
+    lambda: sa.select(Chercheur).where(Chercheur.orcid_id == sa.bindparam("orcid_id"))
+)
+
+# Concatenated search text; must match the ix_chercheurs_search trigram index expression
+_SEP = sa.literal_column("' '")
+_chercheur_search_text = (
+    sa.func.coalesce(Chercheur.nom, sa.literal_column("''")) + _SEP
+    + sa.func.coalesce(Chercheur.prenom, sa.literal_column("''")) + _SEP
+    + sa.func.coalesce(Chercheur.affiliation, sa.literal_column("''")) + _SEP
+    + sa.func.coalesce(Chercheur.orcid_id, sa.literal_column("''")) + _SEP
+    + sa.func.coalesce(Chercheur.domaines_recherche, sa.literal_column("''")) + _SEP
+    + sa.func.coalesce(Chercheur.mots_cles_specifiques, sa.literal_column("''"))
+)
+
 # -----------------------------
 # Pydantic Schemas
 # -----------------------------
@@ -136,8 +210,7 @@ class UtilisateurRead(UtilisateurBase):
     id: int
     date_creation: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Authentication Schemas
 class Token(BaseModel):
@@ -182,8 +255,7 @@ class ChercheurCreate(ChercheurBase):
 class ChercheurRead(ChercheurBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MessageResponse(BaseModel):
     message: str
@@ -206,8 +278,7 @@ class CleApiRead(CleApiBase):
     id: int
     utilisateur_id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # -----------------------------
 # Dependency
@@ -221,19 +292,14 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 # HELPER FUNCTIONS
 # -----------------------------
 
-def hash_password(password: str) -> str:
-    """Simple hash function - in production use bcrypt"""
-    import hashlib
-    return hashlib.sha256(password.encode()).hexdigest()
-
 # Authentication Helper Functions
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash (bcrypt runs in a worker thread)"""
+    return await anyio.to_thread.run_sync(pwd_context.verify, plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash a password (bcrypt runs in a worker thread)"""
+    return await anyio.to_thread.run_sync(pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -267,9 +333,7 @@ async def get_current_user(
         raise credentials_exception
     
     # Get user from database
-    result = await session.execute(
-        sa.select(Utilisateur).where(Utilisateur.email == token_data.email)
-    )
+    result = await session.execute(_user_by_email, {"email": token_data.email})
     user = result.scalar_one_or_none()
     
     if user is None:
@@ -299,9 +363,7 @@ async def get_current_active_user(
 async def login(login_data: LoginRequest, session: AsyncSession = Depends(get_session)):
     """Login endpoint that returns JWT token"""
     # Find user by email
-    result = await session.execute(
-        sa.select(Utilisateur).where(Utilisateur.email == login_data.email)
-    )
+    result = await session.execute(_user_by_email, {"email": login_data.email})
     user = result.scalar_one_or_none()
     
     if not user:
@@ -312,7 +374,7 @@ async def login(login_data: LoginRequest, session: AsyncSession = Depends(get_se
         )
     
     # Verify password
-    if not verify_password(login_data.mot_de_passe, user.mot_de_passe_hash):
+    if not await verify_password(login_data.mot_de_passe, user.mot_de_passe_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -348,12 +410,12 @@ async def login(login_data: LoginRequest, session: AsyncSession = Depends(get_se
 async def register(utilisateur: UtilisateurCreate, session: AsyncSession = Depends(get_session)):
     """Register a new user"""
     # Check if email exists
-    result = await session.execute(sa.select(Utilisateur).where(Utilisateur.email == utilisateur.email))
-    if result.scalar_one_or_none():
+    result = await session.execute(sa.select(sa.exists().where(Utilisateur.email == utilisateur.email)))
+    if result.scalar():
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user with bcrypt hash
-    hashed_password = get_password_hash(utilisateur.mot_de_passe)
+    hashed_password = await get_password_hash(utilisateur.mot_de_passe)
     db_utilisateur = Utilisateur(
         nom=utilisateur.nom,
         prenom=utilisateur.prenom,
@@ -381,19 +443,21 @@ async def change_password(
 ):
     """Change user password"""
     # Verify old password
-    if not verify_password(password_data.old_password, current_user.mot_de_passe_hash):
+    if not await verify_password(password_data.old_password, current_user.mot_de_passe_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Hash new password
-    new_password_hash = get_password_hash(password_data.new_password)
-    
-    # Update password in database
-    current_user.mot_de_passe_hash = new_password_hash
-    current_user.date_modification = datetime.utcnow()
+    new_password_hash = await get_password_hash(password_data.new_password)
     
+    # Update password in database with a single UPDATE statement
+    await session.execute(
+        sa.update(Utilisateur)
+        .where(Utilisateur.id == current_user.id)
+        .values(mot_de_passe_hash=new_password_hash, date_modification=sa.func.now())
+    )
     await session.commit()
     
     return MessageResponse(message="Password changed successfully")
@@ -412,12 +476,12 @@ async def create_utilisateur(
     if not current_user.est_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
     # Check if email exists
-    result = await session.execute(sa.select(Utilisateur).where(Utilisateur.email == utilisateur.email))
-    if result.scalar_one_or_none():
+    result = await session.execute(sa.select(sa.exists().where(Utilisateur.email == utilisateur.email)))
+    if result.scalar():
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user with bcrypt hash
-    hashed_password = get_password_hash(utilisateur.mot_de_passe)
+    hashed_password = await get_password_hash(utilisateur.mot_de_passe)
     db_utilisateur = Utilisateur(
         nom=utilisateur.nom,
         prenom=utilisateur.prenom,
@@ -466,11 +530,16 @@ async def delete_utilisateur(
     """Delete a user (admin only)"""
     if not current_user.est_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    db_utilisateur = await session.get(Utilisateur, utilisateur_id)
+    # Single DELETE ... RETURNING instead of SELECT + DELETE
+    result = await session.execute(
+        sa.delete(Utilisateur)
+        .where(Utilisateur.id == utilisateur_id)
+        .returning(Utilisateur.nom, Utilisateur.prenom)
+    )
+    db_utilisateur = result.first()
     if not db_utilisateur:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
 
-    await session.delete(db_utilisateur)
     await session.commit()
     return MessageResponse(message=f"Utilisateur {db_utilisateur.nom} {db_utilisateur.prenom} supprimé")
 
@@ -485,16 +554,20 @@ async def toggle_user_status(
     if not current_user.est_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
     
-    db_utilisateur = await session.get(Utilisateur, utilisateur_id)
-    if not db_utilisateur:
-        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    
     # Prevent admin from deactivating themselves
-    if db_utilisateur.id == current_user.id:
+    if utilisateur_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot modify your own status")
     
-    db_utilisateur.est_actif = status_update.est_actif
-    db_utilisateur.date_modification = datetime.utcnow()
+    # Single UPDATE ... RETURNING instead of SELECT + UPDATE
+    result = await session.execute(
+        sa.update(Utilisateur)
+        .where(Utilisateur.id == utilisateur_id)
+        .values(est_actif=status_update.est_actif, date_modification=sa.func.now())
+        .returning(Utilisateur.nom, Utilisateur.prenom)
+    )
+    db_utilisateur = result.first()
+    if not db_utilisateur:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
     await session.commit()
     
@@ -512,16 +585,20 @@ async def toggle_user_admin(
     if not current_user.est_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
     
-    db_utilisateur = await session.get(Utilisateur, utilisateur_id)
-    if not db_utilisateur:
-        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    
     # Prevent admin from removing admin from themselves
-    if db_utilisateur.id == current_user.id:
+    if utilisateur_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot modify your own admin status")
     
-    db_utilisateur.est_admin = admin_update.est_admin
-    db_utilisateur.date_modification = datetime.utcnow()
+    # Single UPDATE ... RETURNING instead of SELECT + UPDATE
+    result = await session.execute(
+        sa.update(Utilisateur)
+        .where(Utilisateur.id == utilisateur_id)
+        .values(est_admin=admin_update.est_admin, date_modification=sa.func.now())
+        .returning(Utilisateur.nom, Utilisateur.prenom)
+    )
+    db_utilisateur = result.first()
+    if not db_utilisateur:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
     await session.commit()
     
@@ -537,46 +614,153 @@ async def update_user_profile(
     """Update current user's profile information"""
     # Check if email is being changed and if it already exists
     if profile_update.email != current_user.email:
-        result = await session.execute(sa.select(Utilisateur).where(Utilisateur.email == profile_update.email))
-        if result.scalar_one_or_none():
+        result = await session.execute(
+            sa.select(1)
+            .where(Utilisateur.email == profile_update.email, Utilisateur.id != current_user.id)
+            .limit(1)
+        )
+        if result.scalar() is not None:
             raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Update user profile
-    current_user.nom = profile_update.nom
-    current_user.prenom = profile_update.prenom
-    current_user.email = profile_update.email
-    current_user.telephone = profile_update.telephone
-    current_user.date_modification = datetime.utcnow()
-    
+    # Update user profile with a single UPDATE ... RETURNING statement
+    result = await session.execute(
+        sa.update(Utilisateur)
+        .where(Utilisateur.id == current_user.id)
+        .values(
+            nom=profile_update.nom,
+            prenom=profile_update.prenom,
+            email=profile_update.email,
+            telephone=profile_update.telephone,
+            date_modification=sa.func.now()
+        )
+        .returning(Utilisateur)
+        .execution_options(populate_existing=True)
+    )
+    updated_user = result.scalar_one()
     await session.commit()
-    await session.refresh(current_user)
     
-    return current_user
+    return updated_user
 
 # -----------------------------
 # ROUTES - CHERCHEURS
 # -----------------------------
 
-@app.post("/api/chercheurs/", response_model=ChercheurRead)
-async def create_chercheur(chercheur: ChercheurCreate, session: AsyncSession = Depends(get_session)):
-    # Check if utilisateur exists if provided
-    if chercheur.utilisateur_id:
-        result = await session.get(Utilisateur, chercheur.utilisateur_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+def _trunc255(value: Optional[str]) -> Optional[str]:
+    """Clip a value to the 255-character affiliation column"""
+    return value[:255] if value else value
+
+def _dedupe_by_orcid(chercheurs_data: List[dict]) -> dict:
+    """Map ORCID ID -> payload entry, keeping the last entry per ORCID and dropping entries without one.
+    ON CONFLICT cannot touch the same row twice in one statement, so upsert payloads must be unique."""
+    return {c["orcid_id"]: c for c in chercheurs_data if c.get("orcid_id")}
+
+# Payloads at or above this size are merged through COPY into a temporary table
+COPY_THRESHOLD = 500
+
+_CHERCHEUR_COLUMNS = ("nom", "prenom", "affiliation", "orcid_id", "domaines_recherche", "mots_cles_specifiques")
+_CHERCHEUR_UPDATE_COLUMNS = tuple(c for c in _CHERCHEUR_COLUMNS if c != "orcid_id")
+# Overwrite payload key for each updatable column; a key missing from the payload keeps the stored value
+_CHERCHEUR_PAYLOAD_KEYS = {
+    "nom": "nom",
+    "prenom": "prenom",
+    "affiliation": "affiliation",
+    "domaines_recherche": "domaine_recherche",
+    "mots_cles_specifiques": "mots_cles_specifiques",
+}
+_CHERCHEUR_RETURNING = "id, nom, prenom, orcid_id, affiliation"
+
+# Payload columns plus, per updatable column, whether the payload carried it
+_CREATE_TMP_CHERCHEURS_SQL = sa.text(
+    "CREATE TEMP TABLE tmp_chercheurs ("
+    "nom VARCHAR(255), prenom VARCHAR(255), affiliation TEXT, orcid_id VARCHAR(19), "
+    "domaines_recherche TEXT, mots_cles_specifiques TEXT, "
+    + ", ".join(f"set_{c} BOOLEAN" for c in _CHERCHEUR_UPDATE_COLUMNS)
+    + ") ON COMMIT DROP"
+)
+
+_COPY_UPDATE_SQL = sa.text(
+    f"UPDATE chercheurs c SET "
+    f"{', '.join(f'{col} = CASE WHEN t.set_{col} THEN t.{col} ELSE c.{col} END' for col in _CHERCHEUR_UPDATE_COLUMNS)} "
+    f"FROM tmp_chercheurs t WHERE c.orcid_id = t.orcid_id "
+    f"RETURNING {', '.join(f'c.{col}' for col in _CHERCHEUR_RETURNING.split(', '))}"
+)
+
+# Existing rows were updated above; skipping them here also keeps them from drawing sequence values
+_COPY_INSERT_SQL = sa.text(
+    f"INSERT INTO chercheurs ({', '.join(_CHERCHEUR_COLUMNS)}) "
+    f"SELECT {', '.join(_CHERCHEUR_COLUMNS)} FROM tmp_chercheurs t "
+    f"WHERE NOT EXISTS (SELECT 1 FROM chercheurs c WHERE c.orcid_id = t.orcid_id) "
+    f"ON CONFLICT (orcid_id) DO NOTHING "
+    f"RETURNING {_CHERCHEUR_RETURNING}"
+)
+
+def _overwrite_row(orcid_id: str, chercheur_data: dict) -> tuple:
+    """(insert values, updatable columns present in the payload) for one overwrite entry"""
+    values = {
+        "nom": chercheur_data.get("nom", ""),
+        "prenom": chercheur_data.get("prenom", ""),
+        # Truncate affiliation to 255 characters if it's too long
+        "affiliation": _trunc255(chercheur_data.get("affiliation", "")),
+        "orcid_id": orcid_id,
+        "domaines_recherche": chercheur_data.get("domaine_recherche"),
+        "mots_cles_specifiques": chercheur_data.get("mots_cles_specifiques")
+    }
+    present = tuple(c for c in _CHERCHEUR_UPDATE_COLUMNS if _CHERCHEUR_PAYLOAD_KEYS[c] in chercheur_data)
+    return values, present
+
+async def upsert_chercheurs(session: AsyncSession, rows: List[tuple]) -> List[dict]:
+    """Upsert researchers with one INSERT .. ON CONFLICT per set of payload keys, so each
+    existing row only has the columns its payload carried overwritten"""
+    groups: dict = {}
+    for values, present in rows:
+        groups.setdefault(present, []).append(values)
     
-    # Check if ORCID already exists if provided
-    if chercheur.orcid_id:
-        result = await session.execute(sa.select(Chercheur).where(Chercheur.orcid_id == chercheur.orcid_id))
-        if result.scalar_one_or_none():
-            raise HTTPException(status_code=400, detail="ORCID ID already exists")
+    upserted = []
+    for present, group in groups.items():
+        insert_stmt = pg_insert(Chercheur).values(group)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Chercheur.orcid_id],
+            # A no-op assignment still lets RETURNING yield the existing row
+            set_={column: insert_stmt.excluded[column] for column in present}
+            or {"orcid_id": insert_stmt.excluded.orcid_id}
+        ).returning(Chercheur.id, Chercheur.nom, Chercheur.prenom, Chercheur.orcid_id, Chercheur.affiliation)
+        result = await session.execute(upsert_stmt)
+        upserted.extend(dict(row) for row in result.mappings())
+    return upserted
+
+async def copy_upsert_chercheurs(session: AsyncSession, rows: List[tuple]) -> List[dict]:
+    """Upsert researchers by streaming them with COPY into a temp table, then merging with one
+    UPDATE for the existing rows and one INSERT for the new ones"""
+    # Created through the session so its transaction is open before the driver connection is
+    # used directly: the temp table then lives until commit/rollback instead of autocommitting
+    # and being dropped at once. No defaults, so COPY never draws chercheurs_id_seq.
+    await session.execute(_CREATE_TMP_CHERCHEURS_SQL)
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
     
-    # Create chercheur
-    db_chercheur = Chercheur(**chercheur.dict())
-    session.add(db_chercheur)
-    await session.commit()
-    await session.refresh(db_chercheur)
-    return db_chercheur
+    await driver_connection.copy_records_to_table(
+        "tmp_chercheurs",
+        records=[
+            (*(values[c] for c in _CHERCHEUR_COLUMNS), *(c in present for c in _CHERCHEUR_UPDATE_COLUMNS))
+            for values, present in rows
+        ],
+        columns=[*_CHERCHEUR_COLUMNS, *(f"set_{c}" for c in _CHERCHEUR_UPDATE_COLUMNS)]
+    )
+    updated = await session.execute(_COPY_UPDATE_SQL)
+    inserted = await session.execute(_COPY_INSERT_SQL)
+    return [dict(row) for row in updated.mappings()] + [dict(row) for row in inserted.mappings()]
+
+
+def _stream_overwrite_result(chercheurs: List[dict]) -> Iterator[bytes]:
+    """Encode the overwrite response one researcher at a time instead of as a single document"""
+    count = len(chercheurs)
+    yield b'{"message":' + orjson.dumps(f"Successfully overwrote {count} chercheurs")
+    yield b',"overwritten_count":' + orjson.dumps(count) + b',"chercheurs":['
+    for index, chercheur in enumerate(chercheurs):
+        yield (b"," if index else b"") + orjson.dumps(chercheur)
+    yield b"]}"
+
 
 # Bulk save endpoint for ORCID search results
 @app.post("/api/chercheurs/save")
@@ -593,45 +777,49 @@ async def save_chercheurs_bulk(
         saved_chercheurs = []
         duplicate_chercheurs = []
         failed_chercheurs = []
+        new_rows = []
+        pending_orcids = set()
+        
+        # Look up every already-stored ORCID in one IN query instead of one SELECT per row
+        orcids = {c.get("orcid_id") for c in chercheurs_data if isinstance(c, dict) and c.get("orcid_id")}
+        existing_ids = {}
+        if orcids:
+            existing_result = await session.execute(
+                sa.select(Chercheur.orcid_id, Chercheur.id).where(Chercheur.orcid_id.in_(orcids))
+            )
+            existing_ids = dict(existing_result.tuples().all())
         
         for chercheur_data in chercheurs_data:
             try:
                 # Check if researcher with this ORCID already exists
                 orcid_id = chercheur_data.get("orcid_id")
                 if orcid_id:
-                    existing_query = sa.select(Chercheur).where(Chercheur.orcid_id == orcid_id)
-                    existing_result = await session.execute(existing_query)
-                    existing_chercheur = existing_result.scalar_one_or_none()
+                    existing_id = existing_ids.get(orcid_id)
                     
-                    if existing_chercheur:
+                    # Repeats within this payload get their id once the batch is inserted
+                    if existing_id is not None or orcid_id in pending_orcids:
                         duplicate_chercheurs.append({
                             "orcid_id": orcid_id,
                             "nom": chercheur_data.get("nom", ""),
                             "prenom": chercheur_data.get("prenom", ""),
-                            "existing_id": existing_chercheur.id
+                            "existing_id": existing_id
                         })
                         continue
+                    pending_orcids.add(orcid_id)
                 
-                # Create chercheur instance - map frontend fields to database schema
+                # Map frontend fields to database schema
                 # Truncate affiliation to 255 characters if it's too long
-                affiliation = chercheur_data.get("affiliation", "")
-                if affiliation and len(affiliation) > 255:
-                    affiliation = affiliation[:255]
+                affiliation = _trunc255(chercheur_data.get("affiliation", ""))
                 
-                db_chercheur = Chercheur(
-                    nom=chercheur_data.get("nom", ""),
-                    prenom=chercheur_data.get("prenom", ""),
-                    affiliation=affiliation,
-                    orcid_id=orcid_id,
+                new_rows.append({
+                    "nom": chercheur_data.get("nom", ""),
+                    "prenom": chercheur_data.get("prenom", ""),
+                    "affiliation": affiliation,
+                    "orcid_id": orcid_id,
                     # Map frontend field names to database field names
-                    domaines_recherche=chercheur_data.get("domaine_recherche"),  # frontend sends singular, DB expects plural
-                    mots_cles_specifiques=chercheur_data.get("mots_cles_specifiques")
-                )
-                
-                session.add(db_chercheur)
-                await session.flush()  # Flush to get the ID
-                await session.refresh(db_chercheur)
-                saved_chercheurs.append(db_chercheur)
+                    "domaines_recherche": chercheur_data.get("domaine_recherche"),  # frontend sends singular, DB expects plural
+                    "mots_cles_specifiques": chercheur_data.get("mots_cles_specifiques")
+                })
                 
             except Exception as e:
                 failed_chercheurs.append({
@@ -642,6 +830,20 @@ async def save_chercheurs_bulk(
                 })
                 continue
         
+        if new_rows:
+            # One INSERT ... RETURNING for the whole batch instead of flush + refresh per row
+            result = await session.execute(
+                sa.insert(Chercheur).returning(
+                    Chercheur.id, Chercheur.nom, Chercheur.prenom, Chercheur.orcid_id, Chercheur.affiliation
+                ),
+                new_rows
+            )
+            saved_chercheurs = [dict(row) for row in result.mappings()]
+            saved_ids = {c["orcid_id"]: c["id"] for c in saved_chercheurs if c["orcid_id"]}
+            for duplicate in duplicate_chercheurs:
+                if duplicate["existing_id"] is None:
+                    duplicate["existing_id"] = saved_ids.get(duplicate["orcid_id"])
+        
         await session.commit()
         
         return {
@@ -649,15 +851,7 @@ async def save_chercheurs_bulk(
             "saved_count": len(saved_chercheurs),
             "duplicate_count": len(duplicate_chercheurs),
             "failed_count": len(failed_chercheurs),
-            "chercheurs": [
-                {
-                    "id": c.id,
-                    "nom": c.nom,
-                    "prenom": c.prenom,
-                    "orcid_id": c.orcid_id,
-                    "affiliation": c.affiliation
-                } for c in saved_chercheurs
-            ],
+            "chercheurs": saved_chercheurs,
             "duplicates": duplicate_chercheurs,
             "failed": failed_chercheurs
         }
@@ -679,8 +873,7 @@ async def check_chercheur_by_orcid(
             raise HTTPException(status_code=400, detail="ORCID ID is required")
         
         # Query for existing researcher with this ORCID
-        query = sa.select(Chercheur).where(Chercheur.orcid_id == orcid_id)
-        result = await session.execute(query)
+        result = await session.execute(_chercheur_by_orcid, {"orcid_id": orcid_id})
         existing_chercheur = result.scalar_one_or_none()
         
         if existing_chercheur:
@@ -710,64 +903,66 @@ async def list_chercheurs(
     skip: int = 0, 
     limit: int = 100,
     search: Optional[str] = None,
+    after_id: Optional[int] = None,
     session: AsyncSession = Depends(get_session)
 ):
-    """Get all researchers with optional search"""
+    """Get all researchers with optional search, ordered by id (after_id gives keyset paging)"""
     query = sa.select(Chercheur)
     
-    # Add search functionality across all fields
+    # Add search functionality across all fields (served by the pg_trgm GIN index)
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            sa.or_(
-                Chercheur.nom.ilike(search_term),
-                Chercheur.prenom.ilike(search_term),
-                Chercheur.affiliation.ilike(search_term),
-                Chercheur.orcid_id.ilike(search_term),
-                Chercheur.domaines_recherche.ilike(search_term),
-                Chercheur.mots_cles_specifiques.ilike(search_term)
-            )
-        )
+        query = query.where(_chercheur_search_text.ilike(f"%{search}%"))
+    if after_id is not None:
+        query = query.where(Chercheur.id > after_id)
     
-    query = query.offset(skip).limit(limit)
+    # A stable order so consecutive pages neither repeat nor skip rows
+    query = query.order_by(Chercheur.id).offset(skip).limit(limit)
     result = await session.execute(query)
     chercheurs = result.scalars().all()
     
     return chercheurs
 
-@app.get("/api/chercheurs/{chercheur_id}", response_model=ChercheurRead)
-async def get_chercheur(chercheur_id: int, session: AsyncSession = Depends(get_session)):
+# Read-only lookup served as a plain mapping (same fields as ChercheurRead)
+@app.get("/api/chercheurs/{chercheur_id}", response_model=None)
+async def get_chercheur(chercheur_id: int, session: AsyncSession = Depends(get_session)) -> dict:
     """Get a specific researcher by ID"""
-    result = await session.get(Chercheur, chercheur_id)
-    if not result:
+    result = await session.execute(
+        sa.select(Chercheur.__table__).where(Chercheur.id == chercheur_id)
+    )
+    row = result.mappings().one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Chercheur non trouvé")
-    return result
+    return dict(row)
 
 @app.post("/api/chercheurs/", response_model=ChercheurRead)
 async def create_chercheur(chercheur: ChercheurCreate, session: AsyncSession = Depends(get_session)):
     """Create a new researcher"""
     try:
-        # Check if researcher with this ORCID already exists
-        if chercheur.orcid_id:
-            existing_query = sa.select(Chercheur).where(Chercheur.orcid_id == chercheur.orcid_id)
-            existing_result = await session.execute(existing_query)
-            existing_chercheur = existing_result.scalar_one_or_none()
-            
-            if existing_chercheur:
-                raise HTTPException(
-                    status_code=409, 
-                    detail=f"Researcher with ORCID ID {chercheur.orcid_id} already exists (ID: {existing_chercheur.id})"
-                )
-        
         # Truncate affiliation to 255 characters if it's too long
-        chercheur_dict = chercheur.dict()
-        if chercheur_dict.get("affiliation") and len(chercheur_dict["affiliation"]) > 255:
-            chercheur_dict["affiliation"] = chercheur_dict["affiliation"][:255]
+        chercheur_dict = chercheur.model_dump()
+        chercheur_dict["affiliation"] = _trunc255(chercheur_dict.get("affiliation"))
+        
+        # The unique constraint on orcid_id detects duplicates atomically; no row comes back on conflict
+        result = await session.execute(
+            pg_insert(Chercheur)
+            .values(**chercheur_dict)
+            .on_conflict_do_nothing(index_elements=[Chercheur.orcid_id])
+            .returning(Chercheur)
+        )
+        db_chercheur = result.scalar_one_or_none()
+        
+        if db_chercheur is None:
+            await session.rollback()
+            existing_result = await session.execute(
+                sa.select(Chercheur.id).where(Chercheur.orcid_id == chercheur.orcid_id)
+            )
+            existing_id = existing_result.scalar_one_or_none()
+            raise HTTPException(
+                status_code=409, 
+                detail=f"Researcher with ORCID ID {chercheur.orcid_id} already exists (ID: {existing_id})"
+            )
         
-        db_chercheur = Chercheur(**chercheur_dict)
-        session.add(db_chercheur)
         await session.commit()
-        await session.refresh(db_chercheur)
         return db_chercheur
     except HTTPException:
         # Re-raise HTTP exceptions (like 409 for duplicates)
@@ -787,69 +982,30 @@ async def overwrite_chercheurs(
         if not chercheurs_data:
             raise HTTPException(status_code=400, detail="No chercheurs data provided")
         
+        by_orcid = _dedupe_by_orcid(chercheurs_data)
         overwritten_chercheurs = []
         
-        for chercheur_data in chercheurs_data:
-            orcid_id = chercheur_data.get("orcid_id")
-            if not orcid_id:
-                continue
-                
-            # Find existing researcher
-            existing_query = sa.select(Chercheur).where(Chercheur.orcid_id == orcid_id)
-            existing_result = await session.execute(existing_query)
-            existing_chercheur = existing_result.scalar_one_or_none()
+        if by_orcid:
+            rows = [_overwrite_row(orcid_id, chercheur_data) for orcid_id, chercheur_data in by_orcid.items()]
             
-            if existing_chercheur:
-                # Update existing researcher
-                existing_chercheur.nom = chercheur_data.get("nom", existing_chercheur.nom)
-                existing_chercheur.prenom = chercheur_data.get("prenom", existing_chercheur.prenom)
-                
-                # Truncate affiliation to 255 characters if it's too long
-                affiliation = chercheur_data.get("affiliation", existing_chercheur.affiliation)
-                if affiliation and len(affiliation) > 255:
-                    affiliation = affiliation[:255]
-                existing_chercheur.affiliation = affiliation
-                
-                existing_chercheur.domaines_recherche = chercheur_data.get("domaine_recherche", existing_chercheur.domaines_recherche)
-                existing_chercheur.mots_cles_specifiques = chercheur_data.get("mots_cles_specifiques", existing_chercheur.mots_cles_specifiques)
-                
-                overwritten_chercheurs.append(existing_chercheur)
+            if len(rows) >= COPY_THRESHOLD:
+                overwritten_chercheurs = await copy_upsert_chercheurs(session, rows)
             else:
-                # Create new researcher if not found
-                # Truncate affiliation to 255 characters if it's too long
-                affiliation = chercheur_data.get("affiliation", "")
-                if affiliation and len(affiliation) > 255:
-                    affiliation = affiliation[:255]
-                
-                db_chercheur = Chercheur(
-                    nom=chercheur_data.get("nom", ""),
-                    prenom=chercheur_data.get("prenom", ""),
-                    affiliation=affiliation,
-                    orcid_id=orcid_id,
-                    domaines_recherche=chercheur_data.get("domaine_recherche"),
-                    mots_cles_specifiques=chercheur_data.get("mots_cles_specifiques")
-                )
-                session.add(db_chercheur)
-                overwritten_chercheurs.append(db_chercheur)
+                # Insert new researchers and overwrite existing ones without a per-row round-trip
+                overwritten_chercheurs = await upsert_chercheurs(session, rows)
         
         await session.commit()
         
-        # Refresh all researchers to get their IDs
-        for chercheur in overwritten_chercheurs:
-            await session.refresh(chercheur)
+        if len(overwritten_chercheurs) >= COPY_THRESHOLD:
+            return StreamingResponse(
+                _stream_overwrite_result(overwritten_chercheurs),
+                media_type="application/json"
+            )
         
         return {
             "message": f"Successfully overwrote {len(overwritten_chercheurs)} chercheurs",
             "overwritten_count": len(overwritten_chercheurs),
-            "chercheurs": [
-                {
-                    "id": c.id,
-                    "nom": c.nom,
-                    "prenom": c.prenom,
-                    "orcid_id": c.orcid_id,
-                    "affiliation": c.affiliation
-                } for c in overwritten_chercheurs
-            ]
+            "chercheurs": overwritten_chercheurs
         }
         
     except Exception as e:
@@ -863,23 +1019,28 @@ async def update_chercheur(
     session: AsyncSession = Depends(get_session)
 ):
     """Update an existing researcher"""
-    db_chercheur = await session.get(Chercheur, chercheur_id)
-    if not db_chercheur:
-        raise HTTPException(status_code=404, detail="Chercheur non trouvé")
-    
     try:
-        chercheur_dict = chercheur.dict()
+        chercheur_dict = chercheur.model_dump()
         
         # Truncate affiliation to 255 characters if it's too long
-        if chercheur_dict.get("affiliation") and len(chercheur_dict["affiliation"]) > 255:
-            chercheur_dict["affiliation"] = chercheur_dict["affiliation"][:255]
+        chercheur_dict["affiliation"] = _trunc255(chercheur_dict.get("affiliation"))
         
-        for key, value in chercheur_dict.items():
-            setattr(db_chercheur, key, value)
+        # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+        result = await session.execute(
+            sa.update(Chercheur)
+            .where(Chercheur.id == chercheur_id)
+            .values(**chercheur_dict)
+            .returning(Chercheur)
+            .execution_options(populate_existing=True)
+        )
+        db_chercheur = result.scalar_one_or_none()
+        if db_chercheur is None:
+            raise HTTPException(status_code=404, detail="Chercheur non trouvé")
         
         await session.commit()
-        await session.refresh(db_chercheur)
         return db_chercheur
+    except HTTPException:
+        raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=400, detail=f"Failed to update chercheur: {str(e)}")
@@ -887,14 +1048,20 @@ async def update_chercheur(
 @app.delete("/api/chercheurs/{chercheur_id}", response_model=MessageResponse)
 async def delete_chercheur(chercheur_id: int, session: AsyncSession = Depends(get_session)):
     """Delete a researcher"""
-    db_chercheur = await session.get(Chercheur, chercheur_id)
-    if not db_chercheur:
-        raise HTTPException(status_code=404, detail="Chercheur non trouvé")
-
     try:
-        await session.delete(db_chercheur)
+        result = await session.execute(
+            sa.delete(Chercheur)
+            .where(Chercheur.id == chercheur_id)
+            .returning(Chercheur.nom, Chercheur.prenom)
+        )
+        deleted = result.first()
+        if deleted is None:
+            raise HTTPException(status_code=404, detail="Chercheur non trouvé")
+        
         await session.commit()
-        return MessageResponse(message=f"Chercheur {db_chercheur.prenom} {db_chercheur.nom} supprimé")
+        return MessageResponse(message=f"Chercheur {deleted.prenom} {deleted.nom} supprimé")
+    except HTTPException:
+        raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=400, detail=f"Failed to delete chercheur: {str(e)}")
@@ -903,33 +1070,50 @@ async def delete_chercheur(chercheur_id: int, session: AsyncSession = Depends(ge
 # ROUTES - API KEYS
 # -----------------------------
 
-@app.get("/api/cles-api/{utilisateur_id}", response_model=CleApiRead)
+# Provider by model name: OpenAI prefixes first, then Gemini or DeepSeek anywhere in the name.
+# The matching group's name is the provider; unmatched models use OpenAI.
+_PROVIDER_RE = re.compile(r"(?P<openai>o4-|gpt-)|.*?(?P<gemini>gemini)|.*?(?P<deepseek>deepseek)", re.DOTALL)
+
+# Returned for users without API keys; copied per request with the user id filled in
+_EMPTY_CLES_API = CleApiRead(
+    id=0,
+    utilisateur_id=0,
+    cle_openai=None,
+    cle_gemini=None,
+    cle_claude=None,
+    cle_deepseek=None,
+    cle_scopus=None
+)
+
+# Global API keys row served by get_api_key_for_model, as (fetched_at, CleApi)
+_API_KEYS_CACHE: Optional[tuple] = None
+_API_KEYS_TTL = 30.0
+
+def invalidate_api_keys_cache() -> None:
+    """Force the next model key lookup to re-read the API keys from the database"""
+    global _API_KEYS_CACHE
+    _API_KEYS_CACHE = None
+
+# Read-only lookup served as a plain mapping (same fields as CleApiRead)
+@app.get("/api/cles-api/{utilisateur_id}", response_model=None)
 async def get_api_keys(
     utilisateur_id: int, 
     session: AsyncSession = Depends(get_session),
     current_user: Utilisateur = Depends(get_current_active_user)
-):
+) -> dict:
     """Get API keys for a specific user (admin only)"""
     # if not current_user.est_admin:
     #     raise HTTPException(status_code=403, detail="Admin privileges required")
     result = await session.execute(
-        sa.select(CleApi).where(CleApi.utilisateur_id == utilisateur_id)
+        sa.select(CleApi.__table__).where(CleApi.utilisateur_id == utilisateur_id)
     )
-    db_cles = result.scalar_one_or_none()
+    db_cles = result.mappings().one_or_none()
     
     if not db_cles:
         # Return empty API keys if none exist
-        return CleApiRead(
-            id=0,
-            utilisateur_id=utilisateur_id,
-            cle_openai=None,
-            cle_gemini=None,
-            cle_claude=None,
-            cle_deepseek=None,
-            cle_scopus=None
-        )
+        return _EMPTY_CLES_API.model_copy(update={"utilisateur_id": utilisateur_id}).model_dump()
     
-    return db_cles
+    return dict(db_cles)
 
 @app.post("/api/cles-api/", response_model=CleApiRead)
 async def create_api_keys(
@@ -942,11 +1126,10 @@ async def create_api_keys(
         raise HTTPException(status_code=403, detail="Admin privileges required")
     # Check if API keys already exist for this user
     existing_result = await session.execute(
-        sa.select(CleApi).where(CleApi.utilisateur_id == cles.utilisateur_id)
+        sa.select(sa.exists().where(CleApi.utilisateur_id == cles.utilisateur_id))
     )
-    existing_cles = existing_result.scalar_one_or_none()
     
-    if existing_cles:
+    if existing_result.scalar():
         raise HTTPException(
             status_code=400, 
             detail="API keys already exist for this user. Use PUT to update them."
@@ -964,6 +1147,7 @@ async def create_api_keys(
     
     session.add(db_cles)
     await session.commit()
+    invalidate_api_keys_cache()
     await session.refresh(db_cles)
     return db_cles
 
@@ -977,31 +1161,21 @@ async def update_api_keys(
     """Update API keys for a user (admin only)"""
     if not current_user.est_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    # Check if API keys exist for this user
-    result = await session.execute(
-        sa.select(CleApi).where(CleApi.utilisateur_id == utilisateur_id)
-    )
-    db_cles = result.scalar_one_or_none()
-    
-    if not db_cles:
-        # Create new API keys if they don't exist
-        db_cles = CleApi(utilisateur_id=utilisateur_id)
-        session.add(db_cles)
-    
     # Update only the provided fields
-    if cles.cle_openai is not None:
-        db_cles.cle_openai = cles.cle_openai
-    if cles.cle_gemini is not None:
-        db_cles.cle_gemini = cles.cle_gemini
-    if cles.cle_claude is not None:
-        db_cles.cle_claude = cles.cle_claude
-    if cles.cle_deepseek is not None:
-        db_cles.cle_deepseek = cles.cle_deepseek
-    if cles.cle_scopus is not None:
-        db_cles.cle_scopus = cles.cle_scopus
+    updates = {key: value for key, value in cles.model_dump().items() if value is not None}
+    
+    # Create the user's API keys or update the existing row in one round-trip
+    insert_stmt = pg_insert(CleApi).values(utilisateur_id=utilisateur_id, **updates)
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[CleApi.utilisateur_id],
+        # A no-op assignment still lets RETURNING yield the existing row
+        set_=updates or {"utilisateur_id": insert_stmt.excluded.utilisateur_id}
+    ).returning(CleApi).execution_options(populate_existing=True)
+    result = await session.execute(upsert_stmt)
+    db_cles = result.scalar_one()
     
     await session.commit()
-    await session.refresh(db_cles)
+    invalidate_api_keys_cache()
     return db_cles
 
 @app.delete("/api/cles-api/{utilisateur_id}", response_model=MessageResponse)
@@ -1023,6 +1197,7 @@ async def delete_api_keys(
     
     await session.delete(db_cles)
     await session.commit()
+    invalidate_api_keys_cache()
     return MessageResponse(message="API keys deleted successfully")
 
 @app.get("/api/cles-api/model/{model_name}")
@@ -1032,40 +1207,27 @@ async def get_api_key_for_model(
 ):
     """Get API key for a specific model from the database"""
     try:
-        # Get the first API key record (assuming global API keys)
-        result = await session.execute(sa.select(CleApi))
-        api_keys = result.scalar_one_or_none()
-        
-        if not api_keys:
-            raise HTTPException(status_code=404, detail="No API keys found in database")
-        
-        # Determine which API key to return based on model name
-        print(f"[DEBUG] Model name: {model_name}")
-        print(f"[DEBUG] Available keys - OpenAI: {bool(api_keys.cle_openai)}, Gemini: {bool(api_keys.cle_gemini)}, DeepSeek: {bool(api_keys.cle_deepseek)}")
-        
-        if model_name.startswith("o4-") or model_name.startswith("gpt-"):
-            api_key = api_keys.cle_openai
-            provider = "openai"
-            print(f"[DEBUG] Using OpenAI key for {model_name}")
-        elif model_name.startswith("gemini") or "gemini" in model_name:
-            if api_keys.cle_gemini:
-                api_key = api_keys.cle_gemini
-                provider = "gemini"
-                print(f"[DEBUG] Using Gemini key for {model_name}")
-            else:
-                # Fallback to OpenAI key for Gemini models if Gemini key not available
-                api_key = api_keys.cle_openai
-                provider = "openai"
-                print(f"[DEBUG] Gemini key not available, using OpenAI key for {model_name}")
-        elif model_name.startswith("deepseek") or "deepseek" in model_name:
-            api_key = api_keys.cle_deepseek
-            provider = "deepseek"
-            print(f"[DEBUG] Using DeepSeek key for {model_name}")
+        global _API_KEYS_CACHE
+        cached = _API_KEYS_CACHE
+        if cached is not None and time.monotonic() - cached[0] < _API_KEYS_TTL:
+            api_keys = cached[1]
         else:
-            # Default to OpenAI
+            # Get the first API key record (assuming global API keys)
+            result = await session.execute(sa.select(CleApi))
+            api_keys = result.scalar_one_or_none()
+            
+            if not api_keys:
+                raise HTTPException(status_code=404, detail="No API keys found in database")
+            _API_KEYS_CACHE = (time.monotonic(), api_keys)
+        
+        # Determine which API key to return based on model name (defaults to OpenAI)
+        match = _PROVIDER_RE.match(model_name)
+        provider = match.lastgroup if match else "openai"
+        api_key = getattr(api_keys, f"cle_{provider}")
+        if provider == "gemini" and not api_key:
+            # Fallback to OpenAI key for Gemini models if Gemini key not available
             api_key = api_keys.cle_openai
             provider = "openai"
-            print(f"[DEBUG] Defaulting to OpenAI key for {model_name}")
         
         if not api_key:
             raise HTTPException(status_code=404, detail=f"API key not found for model: {model_name}")
@@ -1108,4 +1270,4 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8020)
+    uvicorn.run(app, host="0.0.0.0", port=8020, loop="uvloop", http="httptools")
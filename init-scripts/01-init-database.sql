@@ -3,6 +3,8 @@
 
 -- Create extensions if needed
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Trigram matching backs the researcher search index (see 02-create-tables-and-user.sql)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Create database if not exists (this is handled by POSTGRES_DB environment variable)
 -- The research_db database is automatically created
@@ -27,10 +27,17 @@ CREATE TABLE IF NOT EXISTS chercheurs (
     mots_cles_specifiques TEXT
 );
 
+-- Trigram index for the researcher search (substring ILIKE across all text fields).
+-- The expression must stay identical to the one built in the backend query.
+CREATE INDEX IF NOT EXISTS ix_chercheurs_search ON chercheurs USING gin ((
+    coalesce(nom, '') || ' ' || coalesce(prenom, '') || ' ' || coalesce(affiliation, '') || ' ' ||
+    coalesce(orcid_id, '') || ' ' || coalesce(domaines_recherche, '') || ' ' || coalesce(mots_cles_specifiques, '')
+) gin_trgm_ops);
+
 -- API Keys table (matching exact local schema)
 CREATE TABLE IF NOT EXISTS cles_api (
     id BIGSERIAL PRIMARY KEY,
-    utilisateur_id BIGINT REFERENCES utilisateurs(id) ON DELETE CASCADE,
+    utilisateur_id BIGINT UNIQUE REFERENCES utilisateurs(id) ON DELETE CASCADE,
     cle_openai TEXT,
     cle_gemini TEXT,
     cle_claude TEXT,
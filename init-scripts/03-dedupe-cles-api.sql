@@ -0,0 +1,59 @@
+-- One-off migration for databases created before cles_api.utilisateur_id was UNIQUE.
+-- The backend refuses to start while a user has several cles_api rows; run this once with
+--   psql -v ON_ERROR_STOP=1 -f init-scripts/03-dedupe-cles-api.sql <database>
+-- Each user's rows are merged into their newest row (keys missing there are taken from the
+-- most recent older row that has them), every removed row is reported with RAISE NOTICE,
+-- and the UNIQUE (utilisateur_id) constraint is added. On a fresh database it does nothing.
+
+DO $$
+DECLARE
+    removed RECORD;
+BEGIN
+    UPDATE cles_api keep SET
+        cle_openai = coalesce(keep.cle_openai, (
+            SELECT o.cle_openai FROM cles_api o
+            WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id AND o.cle_openai IS NOT NULL
+            ORDER BY o.id DESC LIMIT 1
+        )),
+        cle_gemini = coalesce(keep.cle_gemini, (
+            SELECT o.cle_gemini FROM cles_api o
+            WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id AND o.cle_gemini IS NOT NULL
+            ORDER BY o.id DESC LIMIT 1
+        )),
+        cle_claude = coalesce(keep.cle_claude, (
+            SELECT o.cle_claude FROM cles_api o
+            WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id AND o.cle_claude IS NOT NULL
+            ORDER BY o.id DESC LIMIT 1
+        )),
+        cle_deepseek = coalesce(keep.cle_deepseek, (
+            SELECT o.cle_deepseek FROM cles_api o
+            WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id AND o.cle_deepseek IS NOT NULL
+            ORDER BY o.id DESC LIMIT 1
+        )),
+        cle_scopus = coalesce(keep.cle_scopus, (
+            SELECT o.cle_scopus FROM cles_api o
+            WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id AND o.cle_scopus IS NOT NULL
+            ORDER BY o.id DESC LIMIT 1
+        ))
+    WHERE keep.id = (SELECT max(x.id) FROM cles_api x WHERE x.utilisateur_id = keep.utilisateur_id)
+      AND EXISTS (SELECT 1 FROM cles_api o WHERE o.utilisateur_id = keep.utilisateur_id AND o.id < keep.id);
+
+    FOR removed IN
+        DELETE FROM cles_api older USING cles_api newer
+        WHERE older.utilisateur_id = newer.utilisateur_id AND older.id < newer.id
+        RETURNING older.id, older.utilisateur_id
+    LOOP
+        RAISE NOTICE 'cles_api: removed row % of utilisateur % (merged into their newest row)',
+            removed.id, removed.utilisateur_id;
+    END LOOP;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'cles_api'::regclass AND i.indisunique AND i.indnatts = 1
+          AND i.indpred IS NULL AND a.attname = 'utilisateur_id'
+    ) THEN
+        ALTER TABLE cles_api ADD CONSTRAINT cles_api_utilisateur_id_key UNIQUE (utilisateur_id);
+        RAISE NOTICE 'cles_api: added UNIQUE (utilisateur_id)';
+    END IF;
+END $$;
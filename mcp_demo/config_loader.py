@@ -1,9 +1,17 @@
 import os
+import threading
 import yaml
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # In-container default: file lives at /app/db_configs.yaml
 # Allow override via CONFIG_FILE env var
 CONFIG_FILE = os.getenv("CONFIG_FILE", "db_configs.yaml")
@@ -11,7 +19,12 @@ CONFIG_FILE = os.getenv("CONFIG_FILE", "db_configs.yaml")
 # Load .env file (only for local dev)
 load_dotenv()
 
-@dataclass
+# Parsed configs keyed by the YAML file's mtime; rebuilt only when the file changes.
+# Callers share the cached mapping, so it is exposed read-only.
+_CACHE: Optional[Tuple[int, Mapping[Any, "DatabaseConfig"]]] = None
+_CACHE_LOCK = threading.Lock()
+
+@dataclass(slots=True, frozen=True)
 class DatabaseConfig:
     """Database configuration with all required fields"""
     id: int
@@ -24,22 +37,57 @@ class DatabaseConfig:
     dbtype: str
     schema: str = "public"  # Default schema for PostgreSQL
 
-def load_configs() -> Dict[str, DatabaseConfig]:
+def load_configs() -> Mapping[Any, DatabaseConfig]:
     """
     Load database configurations from YAML file and resolve environment variables.
-    Returns a dictionary of DatabaseConfig objects.
+    Returns a read-only mapping of DatabaseConfig objects keyed by ID.
+    The parsed result is cached until the file's mtime changes.
     """
-    # Ensure file exists; if not, create an empty YAML mapping
-    if not os.path.exists(CONFIG_FILE):
+    global _CACHE
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        # Ensure file exists; if not, create an empty YAML mapping
         try:
             with open(CONFIG_FILE, "w") as f:
                 f.write("{}\n")
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
         except Exception:
             # Return empty if cannot create
-            return {}
+            return MappingProxyType({})
+
+    cached = _CACHE
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
 
+    with _CACHE_LOCK:
+        cached = _CACHE
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        db_configs = MappingProxyType(_parse_configs())
+        _CACHE = (mtime, db_configs)
+        return db_configs
+
+def reload_configs() -> Mapping[Any, DatabaseConfig]:
+    """
+    Drop the cached configurations and parse the YAML file again.
+    Use this after changing environment variables the file refers to.
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+    return load_configs()
+
+def _parse_configs() -> Dict[str, DatabaseConfig]:
+    """
+    Parse the YAML file into DatabaseConfig objects (uncached).
+    """
     with open(CONFIG_FILE, "r") as f:
-        configs = yaml.safe_load(f) or {}
+        configs = yaml.load(f, Loader=_Loader) or {}
+
+    # Resolve every referenced password env var once, before building the configs
+    needed = {cfg.get("password_var") for cfg in configs.values() if cfg.get("password_var")}
+    env = {var: os.environ.get(var) for var in needed}
 
     db_configs = {}
     
@@ -49,7 +97,7 @@ def load_configs() -> Dict[str, DatabaseConfig]:
         direct_password = cfg.get("password")
         
         if env_var:
-            password = os.getenv(env_var)
+            password = env.get(env_var)
             if password is None:
                 # Fall back to direct password if env var not found
                 if direct_password:
@@ -95,12 +143,12 @@ def get_db_config(db_id: int) -> DatabaseConfig:
     """
     Get a specific database configuration by ID.
     """
-    configs = load_configs()
-    if db_id not in configs:
-        raise ValueError(f"No database configuration found for ID: {db_id}")
-    return configs[db_id]
+    try:
+        return load_configs()[db_id]
+    except KeyError:
+        raise ValueError(f"No database configuration found for ID: {db_id}") from None
 
-def list_db_configs() -> Dict[str, DatabaseConfig]:
+def list_db_configs() -> Mapping[Any, DatabaseConfig]:
     """
     List all available database configurations.
     """
@@ -3,18 +3,61 @@ import psycopg
 from fastmcp import FastMCP
 from psycopg import sql
 import mysql.connector
+from mysql.connector.pooling import MySQLConnectionPool
+from psycopg_pool import ConnectionPool, PoolClosed, PoolTimeout
 import yaml
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import functools
+import logging
 import os
+import threading
+import time
+from types import MappingProxyType
 from config_loader import load_configs, get_db_config, list_db_configs, DatabaseConfig, CONFIG_FILE
+from config_loader import reload_configs as reload_config_file
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 mcp = FastMCP("Multi-Database Server")
 
+# Hot-path diagnostics go through logging so their formatting is skipped below DEBUG
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _threaded_tool(fn):
+    """Register fn as an async MCP tool that runs it in a worker thread.
+    Blocking connects and queries then no longer stall the server's event loop.
+    The plain function is returned so other code can keep calling it synchronously."""
+    @functools.wraps(fn)
+    async def run_in_thread(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    mcp.tool()(run_in_thread)
+    return fn
+
 # Helpers to make localhost work from inside containers
 LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
 
-def _pg_connect_with_fallback(cfg: dict):
-    """Try PostgreSQL connection with host fallbacks when 'localhost' is used inside containers."""
+# Host that last accepted a connection, per (dbtype, host, port, dbname, user); tried first next time
+_RESOLVED_HOSTS: Dict[tuple, str] = {}
+
+def _host_key(cfg: dict) -> tuple:
+    return (cfg.get('dbtype'), str(cfg.get('host') or '').strip(), cfg.get('port'), cfg.get('dbname'), cfg.get('user'))
+
+def _order_candidates(cfg: dict, candidates: List[str]) -> List[str]:
+    """Move the previously resolved host (if any) to the front of the candidate list."""
+    cached = _RESOLVED_HOSTS.get(_host_key(cfg))
+    if cached in candidates:
+        return [cached] + [h for h in candidates if h != cached]
+    return candidates
+
+def _pg_resolve_host(cfg: dict) -> str:
+    """Return the first PostgreSQL host that accepts a connection, trying fallbacks when 'localhost' is used inside containers."""
     base = {k: v for k, v in cfg.items() if k in ['host', 'port', 'dbname', 'user', 'password']}
     host = str(base.get('host') or '').strip()
     candidates: List[str]
@@ -24,12 +67,13 @@ def _pg_connect_with_fallback(cfg: dict):
     else:
         candidates = [host]
     last_exc = None
-    for h in candidates:
+    for h in _order_candidates(cfg, candidates):
         params = dict(base)
         params['host'] = h
         try:
-            conn = psycopg.connect(**params)
-            return conn
+            psycopg.connect(**params).close()
+            _RESOLVED_HOSTS[_host_key(cfg)] = h
+            return h
         except Exception as e:
             last_exc = e
             continue
@@ -37,8 +81,8 @@ def _pg_connect_with_fallback(cfg: dict):
         raise last_exc
     raise RuntimeError("No PostgreSQL connection candidates available")
 
-def _mysql_connect_with_fallback(cfg: dict):
-    """Try MySQL connection with host fallbacks when 'localhost' is used inside containers."""
+def _mysql_resolve_host(cfg: dict) -> str:
+    """Return the first MySQL host that accepts a connection, trying fallbacks when 'localhost' is used inside containers."""
     host = str(cfg.get('host') or '').strip()
     candidates: List[str]
     if host in LOCAL_HOSTS:
@@ -46,44 +90,275 @@ def _mysql_connect_with_fallback(cfg: dict):
     else:
         candidates = [host]
     last_exc = None
-    for h in candidates:
+    for h in _order_candidates(cfg, candidates):
         try:
-            conn = mysql.connector.connect(
+            mysql.connector.connect(
                 host=h,
                 port=cfg['port'],
                 database=cfg['dbname'],
                 user=cfg['user'],
                 password=cfg['password'],
-                charset='utf8mb4'
-            )
-            return conn
+                charset='utf8mb4',
+                use_unicode=True
+            ).close()
+            _RESOLVED_HOSTS[_host_key(cfg)] = h
+            return h
         except Exception as e:
             last_exc = e
             continue
     if last_exc:
         raise last_exc
     raise RuntimeError("No MySQL connection candidates available")
+
+# Connection pools per db_id, created on first use and dropped whenever the configs change.
+# The host fallback runs once per pool instead of on every tool call.
+_PG_POOLS: Dict[int, ConnectionPool] = {}
+# MySQL pools with a semaphore of the same size: MySQLConnectionPool raises PoolError as soon
+# as it is exhausted, so callers wait for a slot first instead of failing
+_MYSQL_POOLS: Dict[int, Tuple[MySQLConnectionPool, threading.BoundedSemaphore]] = {}
+_POOLS_LOCK = threading.Lock()
+# Per-db creation locks: host resolution probes the network, so it must not hold _POOLS_LOCK
+_POOL_INIT_LOCKS: Dict[int, threading.Lock] = {}
+
+POOL_SIZE = 10
+# Seconds a caller waits for a free pooled connection (psycopg_pool's getconn default)
+POOL_TIMEOUT = 30.0
+
+def _pool_init_lock(db_id: int) -> threading.Lock:
+    with _POOLS_LOCK:
+        return _POOL_INIT_LOCKS.setdefault(db_id, threading.Lock())
+
+def _get_pg_pool(db_id: int, cfg: dict) -> ConnectionPool:
+    """Return the PostgreSQL connection pool for db_id, creating it if needed."""
+    pool = _PG_POOLS.get(db_id)
+    if pool is not None:
+        return pool
+    with _pool_init_lock(db_id):
+        pool = _PG_POOLS.get(db_id)
+        if pool is None:
+            params = {k: v for k, v in cfg.items() if k in ['port', 'dbname', 'user', 'password']}
+            params['host'] = _pg_resolve_host(cfg)
+            # Negotiated at connect time, so pooled sessions are already UTF-8
+            params['client_encoding'] = 'UTF8'
+            pool = ConnectionPool(kwargs=params, min_size=2, max_size=POOL_SIZE, timeout=POOL_TIMEOUT, open=True)
+            with _POOLS_LOCK:
+                _PG_POOLS[db_id] = pool
+        return pool
+
+def _get_mysql_pool(db_id: int, cfg: dict) -> Tuple[MySQLConnectionPool, threading.BoundedSemaphore]:
+    """Return the MySQL connection pool for db_id and its slot semaphore, creating them if needed."""
+    entry = _MYSQL_POOLS.get(db_id)
+    if entry is not None:
+        return entry
+    with _pool_init_lock(db_id):
+        entry = _MYSQL_POOLS.get(db_id)
+        if entry is None:
+            pool = MySQLConnectionPool(
+                pool_name=f"db{db_id}",
+                pool_size=POOL_SIZE,
+                host=_mysql_resolve_host(cfg),
+                port=cfg['port'],
+                database=cfg['dbname'],
+                user=cfg['user'],
+                password=cfg['password'],
+                charset='utf8mb4'
+            )
+            entry = (pool, threading.BoundedSemaphore(POOL_SIZE))
+            with _POOLS_LOCK:
+                _MYSQL_POOLS[db_id] = entry
+        return entry
+
+@contextmanager
+def _pg_connection(db_id: int, cfg: dict):
+    """Borrow a pooled PostgreSQL connection; if no connection can be established, forget the pool and its resolved host."""
+    try:
+        pool = _get_pg_pool(db_id, cfg)
+        conn = pool.getconn()
+    except PoolTimeout:
+        # The pool connects in background workers, so a dead host also surfaces as a timeout.
+        # Only evict when the pool holds no connection at all; otherwise it is merely exhausted
+        # and other workers are still using its connections.
+        if pool.get_stats().get("pool_size", 0) == 0:
+            _RESOLVED_HOSTS.pop(_host_key(cfg), None)
+            _drop_pools(db_id)
+        raise
+    except PoolClosed:
+        # Concurrently replaced pool: the next call picks up the new one
+        raise
+    except psycopg.OperationalError:
+        _RESOLVED_HOSTS.pop(_host_key(cfg), None)
+        _drop_pools(db_id)
+        raise
+    # Errors raised by queries propagate without touching the pool
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.putconn(conn)
+
+@contextmanager
+def _mysql_connection(db_id: int, cfg: dict):
+    """Borrow a pooled MySQL connection; if no connection can be established, forget the pool and its resolved host."""
+    try:
+        pool, slots = _get_mysql_pool(db_id, cfg)
+    except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+        _RESOLVED_HOSTS.pop(_host_key(cfg), None)
+        raise
+    if not slots.acquire(timeout=POOL_TIMEOUT):
+        raise mysql.connector.errors.PoolError(f"No MySQL connection for DB '{db_id}' became free within {POOL_TIMEOUT:g}s")
+    try:
+        try:
+            conn = pool.get_connection()
+        except mysql.connector.errors.PoolError:
+            raise
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            _RESOLVED_HOSTS.pop(_host_key(cfg), None)
+            _drop_pools(db_id)
+            raise
+        try:
+            yield conn
+        finally:
+            # Hands the connection back to the pool
+            conn.close()
+    finally:
+        slots.release()
+
+def _close_pools(pools: List[ConnectionPool]) -> None:
+    for pool in pools:
+        pool.close()
+
+def _drop_pools(db_id: Any = None) -> None:
+    """Close the pools for db_id (or all pools) so the next call reconnects with fresh settings."""
+    closing = []
+    with _POOLS_LOCK:
+        ids = [db_id] if db_id is not None else list(_PG_POOLS) + list(_MYSQL_POOLS)
+        for i in ids:
+            pool = _PG_POOLS.pop(i, None)
+            if pool is not None:
+                closing.append(pool)
+            # MySQL pools have no close(); their idle connections go away with the pool
+            _MYSQL_POOLS.pop(i, None)
+            _IDENTIFIER_CACHE.pop(i, None)
+    # close() joins the pool's workers (up to seconds), and this also runs from the
+    # config tools on the event loop, so close off-thread and outside the lock
+    if closing:
+        threading.Thread(target=_close_pools, args=(closing,), daemon=True).start()
+
+def _db_entry(config: DatabaseConfig) -> Dict[str, Any]:
+    """In-memory DBS entry for one parsed configuration."""
+    return {
+        'host': config.host,
+        'port': config.port,
+        'dbname': config.dbname,
+        'user': config.user,
+        'password': config.password,
+        'dbtype': config.dbtype,
+        'conn_name': config.conn_name,
+        'schema': config.schema
+    }
+
+def _build_dbs(configs) -> Dict[Any, Dict[str, Any]]:
+    return {config.id: _db_entry(config) for config in configs.values()}
+
+def _safe_view(db_id: Any, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing form of a DBS entry with the password masked."""
+    return {
+        "id": db_id,
+        "conn_name": config.get('conn_name', db_id),
+        "host": config.get('host', ''),
+        "port": config.get('port', 5432),
+        "dbname": config.get('dbname', ''),
+        "user": config.get('user', ''),
+        "dbtype": config.get('dbtype', 'postgres'),
+        "schema": config.get('schema', 'public'),
+        "password": "****"  # Hide actual password
+    }
+
+def _build_safe(dbs: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    return {db_id: _safe_view(db_id, config) for db_id, config in dbs.items()}
+
+def _conn_name_key(conn_name: Any) -> str:
+    return str(conn_name).lower()
+
+def _build_conn_name_index(safe: Dict[Any, Dict[str, Any]]) -> Dict[str, Any]:
+    """Lower-cased conn_name -> db_id; the first database wins when names collide."""
+    index: Dict[str, Any] = {}
+    for db_id, safe_config in safe.items():
+        index.setdefault(_conn_name_key(safe_config['conn_name']), db_id)
+    return index
+
+def _publish(dbs: Dict[Any, Dict[str, Any]], safe: Dict[Any, Dict[str, Any]] = None, index: Dict[str, Any] = None) -> None:
+    """Swap in new read-only snapshots of DBS and its derived views.
+    Mutations build fresh dicts and rebind the module names, so readers never see a dict change under them."""
+    global DBS, DBS_SAFE, _CONN_NAME_INDEX
+    if safe is None:
+        safe = _build_safe(dbs)
+    if index is None:
+        index = _build_conn_name_index(safe)
+    DBS = MappingProxyType(dbs)
+    # Password-masked entries served by list_dbs/get_db_by_conn_name
+    DBS_SAFE = MappingProxyType(safe)
+    _CONN_NAME_INDEX = MappingProxyType(index)
+
 # Load database configurations from YAML file
 try:
     configs = load_configs()
     if configs:
-        DBS = {config.id: {
-            'host': config.host,
-            'port': config.port,
-            'dbname': config.dbname,
-            'user': config.user,
-            'password': config.password,
-            'dbtype': config.dbtype,
-            'conn_name': config.conn_name,
-            'schema': config.schema
-        } for config in configs.values()}
-        print(f"✅ Loaded {len(DBS)} database configurations from YAML")
+        dbs = _build_dbs(configs)
+        print(f"✅ Loaded {len(dbs)} database configurations from YAML")
     else:
         print("⚠️  No database configurations found in YAML file")
-        DBS = {}
+        dbs = {}
 except Exception as e:
     print(f"⚠️  Warning: Could not load database configurations: {e}")
-    DBS = {}
+    dbs = {}
+_publish(dbs)
+
+# Raw YAML mapping as last read/written by add_db/remove_db, as (path, mtime_ns, configs).
+# Reused while the file is unchanged so edits skip the read-parse step.
+_RAW_CONFIGS: Any = None
+# ID handed out by the next add_db; recomputed only when the file is (re)read
+_NEXT_ID = 1
+
+def _scan_next_id(configs: Dict[str, Any]) -> int:
+    existing_ids = [cfg.get('id', 0) for cfg in configs.values() if isinstance(cfg.get('id'), int)]
+    return max(existing_ids) + 1 if existing_ids else 1
+
+def _read_raw_configs(path: str) -> Dict[str, Any]:
+    """Return a mutable copy of the YAML mapping, re-reading the file only if it changed."""
+    global _RAW_CONFIGS, _NEXT_ID
+    mtime = os.stat(path).st_mtime_ns
+    cached = _RAW_CONFIGS
+    if cached is not None and cached[0] == path and cached[1] == mtime:
+        return dict(cached[2])
+    with open(path, "r") as f:
+        configs = yaml.load(f, Loader=_Loader) or {}
+    _RAW_CONFIGS = (path, mtime, configs)
+    _NEXT_ID = _scan_next_id(configs)
+    return dict(configs)
+
+def _write_raw_configs(path: str, configs: Dict[str, Any]) -> None:
+    """Serialize once and replace the file atomically (temp file + fsync + os.replace)."""
+    global _RAW_CONFIGS
+    data = yaml.dump(configs, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        # A single-file bind mount (as in docker-compose) cannot be renamed over; write in place
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        with open(path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    _RAW_CONFIGS = (path, os.stat(path).st_mtime_ns, configs)
 
 @mcp.tool()
 def add_db(
@@ -108,17 +383,16 @@ def add_db(
         dbtype: Database type ('postgres' or 'mysql')
         schema: Database schema (defaults to 'public' for PostgreSQL)
     """
+    global _NEXT_ID
     if dbtype not in ('postgres', 'mysql'):
         raise ValueError("dbtype must be exactly 'postgres' or 'mysql' (case-sensitive, no abbreviations)")
     
     # Load existing configs
     config_path = os.getenv("CONFIG_FILE", CONFIG_FILE)
-    with open(config_path, "r") as f:
-        configs = yaml.safe_load(f) or {}
+    configs = _read_raw_configs(config_path)
     
-    # Find the next available ID
-    existing_ids = [cfg.get('id', 0) for cfg in configs.values() if isinstance(cfg.get('id'), int)]
-    next_id = max(existing_ids) + 1 if existing_ids else 1
+    # Next available ID, tracked in memory (see _read_raw_configs)
+    next_id = _NEXT_ID
     
     # Create new config entry
     new_config = {
@@ -136,28 +410,39 @@ def add_db(
     # Use conn_name as the key (lowercase, no spaces)
     key = conn_name.lower().replace(' ', '_').replace('-', '_')
     
-    # Add to configs
+    # Add to configs; an existing entry under the same key is replaced
+    replaced = configs.get(key)
+    old_id = replaced.get('id') if isinstance(replaced, dict) else None
     configs[key] = new_config
     
     # Write back to YAML file
-    with open(config_path, "w") as f:
-        yaml.dump(configs, f, default_flow_style=False, sort_keys=False)
+    _write_raw_configs(config_path, configs)
+    _NEXT_ID = next_id + 1
     
-    # Reload configurations in memory
-    global DBS
-    try:
-        DBS = {config.id: {
-            'host': config.host,
-            'port': config.port,
-            'dbname': config.dbname,
-            'user': config.user,
-            'password': config.password,
-            'dbtype': config.dbtype,
-            'conn_name': config.conn_name,
-            'schema': config.schema
-        } for config in load_configs().values()}
-    except Exception as e:
-        print(f"Warning: Could not reload configurations: {e}")
+    # Mirror the new entry in memory instead of re-reading every configuration
+    dbs = dict(DBS)
+    dbs[next_id] = {
+        'host': host,
+        'port': port,
+        'dbname': dbname,
+        'user': user,
+        'password': password,
+        'dbtype': dbtype,
+        'conn_name': conn_name,
+        'schema': schema
+    }
+    safe = dict(DBS_SAFE)
+    safe[next_id] = _safe_view(next_id, dbs[next_id])
+    index = dict(_CONN_NAME_INDEX)
+    if old_id is not None:
+        # The replaced entry is gone from the YAML file, so forget it here too
+        dbs.pop(old_id, None)
+        safe.pop(old_id, None)
+        index = {name: db_id for name, db_id in index.items() if db_id != old_id}
+    index[_conn_name_key(conn_name)] = next_id
+    _publish(dbs, safe, index)
+    if old_id is not None:
+        _drop_pools(old_id)
     
     # Return structured JSON so clients can parse reliably
     return {
@@ -185,24 +470,10 @@ def list_dbs() -> List[Dict[str, Any]]:
     List all registered databases with full details.
     Returns a list of dictionaries containing database information.
     """
-    databases = []
-    for db_id, config in DBS.items():
-        # Create a safe copy without password for listing
-        safe_config = {
-            "id": db_id,
-            "conn_name": config.get('conn_name', db_id),
-            "host": config.get('host', ''),
-            "port": config.get('port', 5432),
-            "dbname": config.get('dbname', ''),
-            "user": config.get('user', ''),
-            "dbtype": config.get('dbtype', 'postgres'),
-            "schema": config.get('schema', 'public'),
-            "password": "****"  # Hide actual password
-        }
-        databases.append(safe_config)
+    databases = list(DBS_SAFE.values())
     
     if not databases:
-        print("ℹ️  No databases configured. Use add_db tool to add databases.")
+        logger.info("No databases configured. Use add_db tool to add databases.")
     
     return databases
 
@@ -216,8 +487,7 @@ def remove_db(db_id: int) -> str:
     
     # Load existing configs
     config_path = os.getenv("CONFIG_FILE", CONFIG_FILE)
-    with open(config_path, "r") as f:
-        configs = yaml.safe_load(f) or {}
+    configs = _read_raw_configs(config_path)
     
     # Find and remove the config with the specified ID
     key_to_remove = None
@@ -233,11 +503,16 @@ def remove_db(db_id: int) -> str:
     del configs[key_to_remove]
     
     # Write back to YAML file
-    with open(config_path, "w") as f:
-        yaml.dump(configs, f, default_flow_style=False, sort_keys=False)
+    _write_raw_configs(config_path, configs)
     
     # Remove from memory
-    del DBS[db_id]
+    dbs = dict(DBS)
+    del dbs[db_id]
+    safe = dict(DBS_SAFE)
+    safe.pop(db_id, None)
+    # Another database may share the removed name, so rebuild the index rather than pop
+    _publish(dbs, safe)
+    _drop_pools(db_id)
     
     return f"Database '{db_id}' removed from YAML configuration."
 
@@ -247,18 +522,9 @@ def reload_configs() -> str:
     Reload database configurations from the YAML file.
     Useful when you've updated the configuration file.
     """
-    global DBS
     try:
-        DBS = {config.id: {
-            'host': config.host,
-            'port': config.port,
-            'dbname': config.dbname,
-            'user': config.user,
-            'password': config.password,
-            'dbtype': config.dbtype,
-            'conn_name': config.conn_name,
-            'schema': config.schema
-        } for config in load_configs().values()}
+        _publish(_build_dbs(reload_config_file()))
+        _drop_pools()
         return f"Successfully reloaded {len(DBS)} database configurations."
     except Exception as e:
         return f"Error reloading configurations: {e}"
@@ -266,24 +532,15 @@ def reload_configs() -> str:
 @mcp.tool()
 def get_db_by_conn_name(conn_name: str) -> Dict[str, Any]:
     """
-    Get database configuration by connection name.
+    Get database configuration by connection name (case-insensitive).
     """
-    for db_id, config in DBS.items():
-        if config.get('conn_name') == conn_name:
-                    return {
-            "id": db_id,
-            "conn_name": config.get('conn_name', db_id),
-            "host": config.get('host', ''),
-            "port": config.get('port', 5432),
-            "dbname": config.get('dbname', ''),
-            "user": config.get('user', ''),
-            "dbtype": config.get('dbtype', 'postgres'),
-            "schema": config.get('schema', 'public'),
-            "password": "****"  # Hide actual password
-        }
+    db_id = _CONN_NAME_INDEX.get(_conn_name_key(conn_name))
+    safe_config = DBS_SAFE.get(db_id) if db_id is not None else None
+    if safe_config is not None:
+        return safe_config
     raise ValueError(f"No database found with connection name '{conn_name}'")
 
-@mcp.tool()
+@_threaded_tool
 def introspect_schema(db_id: int, schema_name: str = 'public') -> dict[str, dict[str, str]]:
     """
     Return tables and columns (name → type) for the given db_id.
@@ -297,14 +554,12 @@ def introspect_schema(db_id: int, schema_name: str = 'public') -> dict[str, dict
         raise ValueError(f"No DB with id '{db_id}'.")
     dbtype = cfg.get('dbtype', 'postgres')
     
-    if dbtype == 'postgres':
-        return introspect_postgres_schema(db_id, schema_name)
-    elif dbtype == 'mysql':
-        return introspect_mysql_schema(db_id)
-    else:
+    introspect = _INTROSPECTORS.get(dbtype)
+    if introspect is None:
         raise ValueError(f"Unsupported dbtype: {dbtype}")
+    return introspect(db_id, schema_name)
 
-@mcp.tool()
+@_threaded_tool
 def introspect_postgres_schema(db_id: int, schema_name: str = 'public') -> dict[str, dict[str, str]]:
     """
     Return PostgreSQL database schema with detailed table and column information.
@@ -322,7 +577,7 @@ def introspect_postgres_schema(db_id: int, schema_name: str = 'public') -> dict[
     
     # Use explicit connection parameters to avoid issues with container networking
     try:
-        conn = _pg_connect_with_fallback(cfg)
+        _get_pg_pool(db_id, cfg)
     except Exception as e:
         return {
             '_metadata': {
@@ -330,101 +585,91 @@ def introspect_postgres_schema(db_id: int, schema_name: str = 'public') -> dict[
                 'connection_params': f"host={cfg.get('host')} port={cfg.get('port')} dbname={cfg.get('dbname')} user={cfg.get('user')}"
             }
         }
-    cur = conn.cursor()
-    
-    # First, let's check if the schema exists and list all available schemas
-    cur.execute("""
-        SELECT schema_name 
-        FROM information_schema.schemata 
-        WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
-          AND schema_name NOT LIKE 'pg_%'
-        ORDER BY schema_name;
-    """)
-    available_schemas = [row[0] for row in cur.fetchall()]
-    
-    # Add 'public' as fallback if no schemas found
-    if not available_schemas:
-        available_schemas = ['public']
-    
-    # If the requested schema doesn't exist, use the first available one or 'public'
-    if schema_name not in available_schemas:
-        if 'public' in available_schemas:
-            schema_name = 'public'
-        elif available_schemas:
-            schema_name = available_schemas[0]
-    
-    # Check if there are any tables in the schema first
-    cur.execute("""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = %s AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
-    """, (schema_name,))
-    
-    table_names = [row[0] for row in cur.fetchall()]
-    
-    # If no tables found in requested schema, let's check ALL schemas
-    if not table_names:
+    with _pg_connection(db_id, cfg) as conn:
+        cur = conn.cursor()
+    
+        # One round trip over pg_catalog: schema discovery, the schema actually used
+        # (requested one, else 'public', else the first available) and every column with its keys
         cur.execute("""
-            SELECT table_schema, table_name 
-            FROM information_schema.tables 
-            WHERE table_type = 'BASE TABLE'
-            ORDER BY table_schema, table_name;
-        """)
-        all_tables = cur.fetchall()
+            WITH ns AS (
+                SELECT n.oid, n.nspname::text AS nspname
+                FROM pg_catalog.pg_namespace n
+                WHERE n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+                  AND n.nspname NOT LIKE 'pg_%%'
+                  AND has_schema_privilege(n.oid, 'USAGE')
+            ),
+            target AS (
+                SELECT coalesce(
+                    (SELECT nspname FROM ns WHERE nspname = %(schema)s),
+                    (SELECT nspname FROM ns WHERE nspname = 'public'),
+                    (SELECT min(nspname) FROM ns),
+                    'public'
+                ) AS nspname
+            ),
+            tbl AS (
+                SELECT c.oid, c.relname::text AS relname
+                FROM pg_catalog.pg_class c
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+                JOIN target ON n.nspname = target.nspname
+                WHERE c.relkind IN ('r', 'p')
+                  AND has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+            ),
+            -- PK and FK flags come from a single pass over pg_constraint
+            keys AS (
+                SELECT con.conrelid, k.attnum,
+                       bool_or(con.contype = 'p') AS is_pk,
+                       bool_or(con.contype = 'f') AS is_fk
+                FROM pg_catalog.pg_constraint con
+                JOIN tbl ON tbl.oid = con.conrelid
+                CROSS JOIN LATERAL unnest(con.conkey) AS k(attnum)
+                WHERE con.contype IN ('p', 'f')
+                GROUP BY con.conrelid, k.attnum
+            )
+            SELECT
+                target.nspname,
+                (SELECT coalesce(array_agg(nspname ORDER BY nspname), '{}'::text[]) FROM ns),
+                tbl.relname,
+                a.attname::text,
+                format_type(a.atttypid, a.atttypmod),
+                a.attnotnull,
+                pg_get_expr(d.adbin, d.adrelid),
+                coalesce(k.is_pk, false),
+                coalesce(k.is_fk, false)
+            FROM target
+            LEFT JOIN tbl ON true
+            LEFT JOIN pg_catalog.pg_attribute a
+                ON a.attrelid = tbl.oid AND a.attnum > 0 AND NOT a.attisdropped
+            LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            LEFT JOIN keys k ON k.conrelid = a.attrelid AND k.attnum = a.attnum
+            ORDER BY tbl.relname, a.attnum;
+        """, {'schema': schema_name})
+    
+        rows = cur.fetchall()
+        schema_name = rows[0][0]
+        # Add 'public' as fallback if no schemas found
+        available_schemas = rows[0][1] or ['public']
+        table_names = list(dict.fromkeys(row[2] for row in rows if row[2] is not None))
+    
+        # If no tables found in requested schema, let's check ALL schemas
+        if not table_names:
+            cur.execute("""
+                SELECT table_schema, table_name 
+                FROM information_schema.tables 
+                WHERE table_type = 'BASE TABLE'
+                ORDER BY table_schema, table_name;
+            """)
+            all_tables = cur.fetchall()
         
-        conn.close()
-        return {
-            '_metadata': {
-                'requested_schema': schema_name,
-                'available_schemas': ', '.join(available_schemas),
-                'table_count': '0',
-                'message': f'No tables found in schema "{schema_name}". Available schemas: {", ".join(available_schemas)}',
-                'all_tables_found': f'Found {len(all_tables)} tables in database: ' + ', '.join([f'{schema}.{table}' for schema, table in all_tables[:10]]) + ('...' if len(all_tables) > 10 else ''),
-                'debug_info': f'Queried schema: {schema_name}, Available schemas: {available_schemas}'
+            return {
+                '_metadata': {
+                    'requested_schema': schema_name,
+                    'available_schemas': ', '.join(available_schemas),
+                    'table_count': '0',
+                    'message': f'No tables found in schema "{schema_name}". Available schemas: {", ".join(available_schemas)}',
+                    'all_tables_found': f'Found {len(all_tables)} tables in database: ' + ', '.join([f'{schema}.{table}' for schema, table in all_tables[:10]]) + ('...' if len(all_tables) > 10 else ''),
+                    'debug_info': f'Queried schema: {schema_name}, Available schemas: {available_schemas}'
+                }
             }
-        }
-    
-    # Now get detailed column information for all tables
-    cur.execute("""
-        SELECT 
-            t.table_name,
-            c.column_name,
-            c.data_type,
-            c.is_nullable,
-            c.column_default,
-            CASE 
-                WHEN pk.column_name IS NOT NULL THEN 'PRIMARY KEY'
-                WHEN fk.column_name IS NOT NULL THEN 'FOREIGN KEY'
-                ELSE ''
-            END as key_type,
-            c.character_maximum_length,
-            c.numeric_precision,
-            c.numeric_scale
-        FROM information_schema.tables t
-        LEFT JOIN information_schema.columns c ON t.table_name = c.table_name AND t.table_schema = c.table_schema
-        LEFT JOIN (
-            SELECT kcu.column_name, kcu.table_name, kcu.table_schema
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.table_constraints tc 
-                ON kcu.constraint_name = tc.constraint_name
-                AND kcu.table_schema = tc.table_schema
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-        ) pk ON c.column_name = pk.column_name AND c.table_name = pk.table_name AND c.table_schema = pk.table_schema
-        LEFT JOIN (
-            SELECT kcu.column_name, kcu.table_name, kcu.table_schema
-            FROM information_schema.key_column_usage kcu
-            JOIN information_schema.table_constraints tc 
-                ON kcu.constraint_name = tc.constraint_name
-                AND kcu.table_schema = tc.table_schema
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-        ) fk ON c.column_name = fk.column_name AND c.table_name = fk.table_name AND c.table_schema = fk.table_schema
-        WHERE t.table_schema = %s AND t.table_type = 'BASE TABLE'
-        ORDER BY t.table_name, c.ordinal_position;
-    """, (schema_name,))
-    
-    rows = cur.fetchall()
-    conn.close()
     
     schema: dict[str, dict[str, str]] = {}
     
@@ -436,33 +681,33 @@ def introspect_postgres_schema(db_id: int, schema_name: str = 'public') -> dict[
         'tables_found': ', '.join(table_names)
     }
     
+    prev_table = None
+    columns: dict[str, str] = {}
     for row in rows:
-        if row[0] is None or row[1] is None:  # Skip if table_name or column_name is None
+        if row[2] is None or row[3] is None:  # Skip if table_name or column_name is None
             continue
             
-        table_name, column_name, data_type, is_nullable, column_default, key_type, char_max_len, num_precision, num_scale = row
+        _, _, table_name, column_name, data_type, not_null, column_default, is_pk, is_fk = row
+        # Rows arrive ordered by table, so look up the table entry only when it changes
+        if table_name != prev_table:
+            columns = schema.setdefault(table_name, {})
+            prev_table = table_name
         
-        # Build detailed column type info
-        type_info = data_type or 'unknown'
-        if char_max_len:
-            type_info += f"({char_max_len})"
-        elif num_precision and num_scale:
-            type_info += f"({num_precision},{num_scale})"
-        elif num_precision:
-            type_info += f"({num_precision})"
-            
-        if is_nullable == 'NO':
-            type_info += " NOT NULL"
+        # Build detailed column type info (format_type already includes length/precision)
+        parts = [data_type or 'unknown']
+        if not_null:
+            parts.append(" NOT NULL")
         if column_default:
-            type_info += f" DEFAULT {column_default}"
-        if key_type:
-            type_info += f" [{key_type}]"
-            
-        schema.setdefault(table_name, {})[column_name] = type_info
+            parts.append(f" DEFAULT {column_default}")
+        if is_pk:
+            parts.append(" [PRIMARY KEY]")
+        elif is_fk:
+            parts.append(" [FOREIGN KEY]")
+        columns[column_name] = ''.join(parts)
     
     return schema
 
-@mcp.tool()
+@_threaded_tool
 def debug_postgres_connection(db_id: int) -> dict[str, str]:
     """
     Debug PostgreSQL connection and return basic database information.
@@ -475,38 +720,36 @@ def debug_postgres_connection(db_id: int) -> dict[str, str]:
         raise ValueError(f"Database '{db_id}' is not a PostgreSQL database")
     
     try:
-        conn_params = {k: v for k, v in cfg.items() if k in ['host', 'port', 'dbname', 'user', 'password']}
-        conn = psycopg.connect(**conn_params)
-        cur = conn.cursor()
-        
-        # Get basic database info
-        cur.execute("SELECT current_database(), current_schema(), version();")
-        db_info = cur.fetchone()
-        current_db, current_schema, version = db_info
-        
-        # Get all schemas
-        cur.execute("SELECT schema_name FROM information_schema.schemata ORDER BY schema_name;")
-        all_schemas = [row[0] for row in cur.fetchall()]
-        
-        # Get all tables across all schemas
-        cur.execute("""
-            SELECT table_schema, table_name, table_type
-            FROM information_schema.tables 
-            WHERE table_type = 'BASE TABLE'
-            ORDER BY table_schema, table_name;
-        """)
-        all_tables = cur.fetchall()
-        
-        # Get tables in 'public' schema specifically
-        cur.execute("""
-            SELECT table_name
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-            ORDER BY table_name;
-        """)
-        public_tables = [row[0] for row in cur.fetchall()]
-        
-        conn.close()
+        with _pg_connection(db_id, cfg) as conn:
+            # Pipeline mode sends all four queries back-to-back and syncs once;
+            # each statement gets its own cursor so its results stay readable
+            with conn.pipeline():
+                # Get basic database info
+                info_cur = conn.execute("SELECT current_database(), current_schema(), version();")
+                
+                # Get all schemas
+                schemas_cur = conn.execute("SELECT schema_name FROM information_schema.schemata ORDER BY schema_name;")
+                
+                # Get all tables across all schemas
+                tables_cur = conn.execute("""
+                    SELECT table_schema, table_name, table_type
+                    FROM information_schema.tables 
+                    WHERE table_type = 'BASE TABLE'
+                    ORDER BY table_schema, table_name;
+                """)
+                
+                # Get tables in 'public' schema specifically
+                public_cur = conn.execute("""
+                    SELECT table_name
+                    FROM information_schema.tables 
+                    WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
+                    ORDER BY table_name;
+                """)
+            
+            current_db, current_schema, version = info_cur.fetchone()
+            all_schemas = [row[0] for row in schemas_cur.fetchall()]
+            all_tables = tables_cur.fetchall()
+            public_tables = [row[0] for row in public_cur.fetchall()]
         
         return {
             'current_database': current_db,
@@ -526,7 +769,14 @@ def debug_postgres_connection(db_id: int) -> dict[str, str]:
             'connection_config': f"host={cfg.get('host')}, port={cfg.get('port')}, dbname={cfg.get('dbname')}, user={cfg.get('user')}"
         }
 
-@mcp.tool()
+# Readable labels for information_schema.COLUMNS.COLUMN_KEY values
+_MYSQL_KEY_LABELS = {
+    'PRI': 'PRIMARY KEY',
+    'UNI': 'UNIQUE KEY',
+    'MUL': 'INDEX'
+}
+
+@_threaded_tool
 def introspect_mysql_schema(db_id: int) -> dict[str, dict[str, str]]:
     """
     Return MySQL database schema with detailed table and column information.
@@ -539,117 +789,224 @@ def introspect_mysql_schema(db_id: int) -> dict[str, dict[str, str]]:
     if cfg.get('dbtype') != 'mysql':
         raise ValueError(f"Database '{db_id}' is not a MySQL database")
     
-    conn = _mysql_connect_with_fallback(cfg)
-    cur = conn.cursor()
-    
-    # Enhanced MySQL schema query with more details
-    cur.execute("""
-        SELECT 
-            c.TABLE_NAME,
-            c.COLUMN_NAME,
-            c.COLUMN_TYPE,
-            c.IS_NULLABLE,
-            c.COLUMN_DEFAULT,
-            c.COLUMN_KEY,
-            c.EXTRA,
-            c.COLUMN_COMMENT
-        FROM INFORMATION_SCHEMA.COLUMNS c
-        JOIN INFORMATION_SCHEMA.TABLES t 
-            ON c.TABLE_SCHEMA = t.TABLE_SCHEMA 
-            AND c.TABLE_NAME = t.TABLE_NAME
-        WHERE c.TABLE_SCHEMA = %s 
-            AND t.TABLE_TYPE = 'BASE TABLE'
-        ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION;
-    """, (cfg['dbname'],))
-    
-    rows = cur.fetchall()
-    conn.close()
+    with _mysql_connection(db_id, cfg) as conn:
+        cur = conn.cursor()
+    
+        # Enhanced MySQL schema query with more details
+        cur.execute("""
+            SELECT 
+                c.TABLE_NAME,
+                c.COLUMN_NAME,
+                c.COLUMN_TYPE,
+                c.IS_NULLABLE,
+                c.COLUMN_DEFAULT,
+                c.COLUMN_KEY,
+                c.EXTRA,
+                c.COLUMN_COMMENT
+            FROM INFORMATION_SCHEMA.COLUMNS c
+            JOIN INFORMATION_SCHEMA.TABLES t 
+                ON c.TABLE_SCHEMA = t.TABLE_SCHEMA 
+                AND c.TABLE_NAME = t.TABLE_NAME
+            WHERE c.TABLE_SCHEMA = %s 
+                AND t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION;
+        """, (cfg['dbname'],))
+    
+        rows = cur.fetchall()
     
     schema: dict[str, dict[str, str]] = {}
+    prev_table = None
+    columns: dict[str, str] = {}
     for row in rows:
         table_name, column_name, column_type, is_nullable, column_default, column_key, extra, column_comment = row
+        # Rows arrive ordered by table, so look up the table entry only when it changes
+        if table_name != prev_table:
+            columns = schema.setdefault(table_name, {})
+            prev_table = table_name
         
         # Build detailed column type info
-        type_info = column_type
-        
+        parts = [column_type]
         if is_nullable == 'NO':
-            type_info += " NOT NULL"
+            parts.append(" NOT NULL")
         if column_default is not None:
-            type_info += f" DEFAULT {column_default}"
+            parts.append(f" DEFAULT {column_default}")
         if column_key:
-            key_labels = {
-                'PRI': 'PRIMARY KEY',
-                'UNI': 'UNIQUE KEY',
-                'MUL': 'INDEX'
-            }
-            type_info += f" [{key_labels.get(column_key, column_key)}]"
+            parts.append(f" [{_MYSQL_KEY_LABELS.get(column_key, column_key)}]")
         if extra:
-            type_info += f" {extra}"
+            parts.append(f" {extra}")
         if column_comment:
-            type_info += f" COMMENT '{column_comment}'"
-            
-        schema.setdefault(table_name, {})[column_name] = type_info
+            parts.append(f" COMMENT '{column_comment}'")
+        columns[column_name] = ''.join(parts)
     
     return schema
 
-def to_serializable(results):
-    serializable = []
+# SELECT statements by (table, columns, condition keys, limited); condition values and
+# the LIMIT stay bound parameters
+@functools.lru_cache(maxsize=256)
+def _pg_select_query(table: str, columns: tuple, condition_keys: tuple, limited: bool = False) -> sql.Composed:
+    cols = sql.SQL(',').join(map(sql.Identifier, columns))
+    cond_sql = (
+        sql.SQL(' AND ').join(
+            sql.Composed([sql.Identifier(k), sql.SQL("=%s")])
+            for k in condition_keys
+        )
+        if condition_keys else sql.SQL("TRUE")
+    )
+    query = sql.SQL("SELECT {} FROM {} WHERE {}").format(
+        cols, sql.Identifier(table), cond_sql
+    )
+    return query + sql.SQL(" LIMIT %s") if limited else query
+
+@functools.lru_cache(maxsize=256)
+def _mysql_select_query(table: str, columns: tuple, condition_keys: tuple, limited: bool = False) -> str:
+    cols = ','.join(f'`{c}`' for c in columns)
+    conds = ' AND '.join(f'`{k}`=%s' for k in condition_keys) if condition_keys else '1'
+    query = f"SELECT {cols} FROM `{table}` WHERE {conds}"
+    return f"{query} LIMIT %s" if limited else query
+
+# Rows pulled from the cursor per fetchmany() call in select_data
+FETCH_BATCH_SIZE = 4096
+
+# PostgreSQL text-like type OIDs (text, varchar, bpchar, name): values already arrive as str
+_PG_TEXT_OIDS = frozenset({25, 1043, 1042, 19})
+
+def _text_or_empty(value):
+    return "" if value is None else value
+
+def _str_or_empty(value):
+    return "" if value is None else str(value)
+
+def _column_formatters(description, text_types=frozenset()) -> list:
+    """One formatter per result column, chosen once from the cursor description instead of per value."""
+    return [_text_or_empty if column[1] in text_types else _str_or_empty for column in description]
+
+def to_serializable(results, names, formatters):
     for row in results:
-        serializable.append({k: str(v) if v is not None else "" for k, v in row.items()})
-    return serializable
+        yield dict(zip(names, [fmt(value) for fmt, value in zip(formatters, row)]))
 
-@mcp.tool()
+def _fetch_serializable(cur, text_types=frozenset()) -> list[dict[str, str]]:
+    """Drain a tuple cursor in batches, serializing each batch as it arrives instead of keeping a raw copy of every row."""
+    names = [column[0] for column in cur.description]
+    formatters = _column_formatters(cur.description, text_types)
+    serializable = []
+    while True:
+        batch = cur.fetchmany(FETCH_BATCH_SIZE)
+        if not batch:
+            return serializable
+        serializable.extend(to_serializable(batch, names, formatters))
+
+# Known tables -> column names per db_id, as (fetched_at, {table: {column, ...}}), for select_data validation
+_IDENTIFIER_CACHE: Dict[Any, tuple] = {}
+IDENTIFIER_CACHE_TTL = 300.0
+
+# Every selectable table/view column visible to the connection (search_path / current database)
+_IDENTIFIER_SQL = {
+    'postgres': """
+        SELECT c.relname::text, a.attname::text
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid
+        WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f')
+          AND a.attnum > 0 AND NOT a.attisdropped
+          AND pg_catalog.pg_table_is_visible(c.oid);
+    """,
+    # MySQL column names are case-insensitive even when quoted
+    'mysql': """
+        SELECT TABLE_NAME, LOWER(COLUMN_NAME)
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE();
+    """,
+}
+
+def _load_identifiers(db_id: int, cfg: dict) -> Dict[str, set]:
+    dbtype = cfg.get('dbtype', 'postgres')
+    if dbtype == 'postgres':
+        with _pg_connection(db_id, cfg) as conn:
+            rows = conn.execute(_IDENTIFIER_SQL[dbtype]).fetchall()
+    else:
+        with _mysql_connection(db_id, cfg) as conn:
+            cur = conn.cursor()
+            cur.execute(_IDENTIFIER_SQL[dbtype])
+            rows = cur.fetchall()
+    known: Dict[str, set] = {}
+    for table_name, column_name in rows:
+        known.setdefault(table_name, set()).add(column_name)
+    _IDENTIFIER_CACHE[db_id] = (time.monotonic(), known)
+    return known
+
+def _check_identifiers(db_id: int, cfg: dict, table: str, columns: list[str], conditions: dict[str, str]) -> None:
+    """Reject unknown tables/columns before touching the database; a miss re-reads the catalog once."""
+    fold = str.lower if cfg.get('dbtype') == 'mysql' else str
+    wanted = [fold(c) for c in (*columns, *conditions)]
+    cached = _IDENTIFIER_CACHE.get(db_id)
+    fresh = cached is None or time.monotonic() - cached[0] >= IDENTIFIER_CACHE_TTL
+    known = _load_identifiers(db_id, cfg) if fresh else cached[1]
+    if not fresh and (table not in known or any(c not in known[table] for c in wanted)):
+        # The table/column may have been created since the cache was filled
+        known = _load_identifiers(db_id, cfg)
+    table_columns = known.get(table)
+    if table_columns is None:
+        raise ValueError(f"Unknown table '{table}' in DB '{db_id}'.")
+    unknown = [c for c, f in zip((*columns, *conditions), wanted) if f not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s) {', '.join(unknown)} in table '{table}'.")
+
+def _select_params(keys: tuple, conditions: dict[str, str], limit: Optional[int]) -> tuple:
+    params = tuple(conditions[k] for k in keys)
+    return params if limit is None else (*params, limit)
+
+def _select_pg(db_id: int, cfg: dict, table: str, columns: list[str], conditions: dict[str, str], limit: Optional[int] = None) -> list[dict[str, str]]:
+    with _pg_connection(db_id, cfg) as conn:
+        # Condition keys are sorted so equivalent filters share one cached statement
+        keys = tuple(sorted(conditions))
+        query = _pg_select_query(table, tuple(columns), keys, limit is not None)
+        # Named (server-side) cursor: rows stay on the server and arrive FETCH_BATCH_SIZE at a time
+        with conn.cursor(name="select_data") as cur:
+            cur.execute(query, _select_params(keys, conditions, limit))
+            return _fetch_serializable(cur, _PG_TEXT_OIDS)
+
+def _select_mysql(db_id: int, cfg: dict, table: str, columns: list[str], conditions: dict[str, str], limit: Optional[int] = None) -> list[dict[str, str]]:
+    with _mysql_connection(db_id, cfg) as conn:
+        # Unbuffered: fetchmany() reads rows off the socket instead of the whole result up front
+        cur = conn.cursor(buffered=False)
+        keys = tuple(sorted(conditions))
+        query = _mysql_select_query(table, tuple(columns), keys, limit is not None)
+        cur.execute(query, _select_params(keys, conditions, limit))
+        return _fetch_serializable(cur)
+
+# Per-dbtype implementations behind the generic tools
+_INTROSPECTORS = {
+    'postgres': lambda db_id, schema_name: introspect_postgres_schema(db_id, schema_name),
+    'mysql': lambda db_id, schema_name: introspect_mysql_schema(db_id),
+}
+_SELECTORS = {
+    'postgres': _select_pg,
+    'mysql': _select_mysql,
+}
+
+@_threaded_tool
 def select_data(
     db_id: int,
     table: str,
     columns: list[str],
-    conditions: dict[str, str] = {}
+    conditions: dict[str, str] = {},
+    limit: Optional[int] = None
 ) -> list[dict[str, str]]:
     """
-    Execute a SELECT on one of the registered databases.
+    Execute a SELECT on one of the registered databases, returning at most `limit` rows if given.
     """
     cfg = DBS.get(db_id)
     if not cfg:
         raise ValueError(f"No DB with id '{db_id}'.")
     dbtype = cfg.get('dbtype', 'postgres')
-    if dbtype == 'postgres':
-        conn = _pg_connect_with_fallback(cfg)
-        # Ensure UTF-8 encoding for the session
-        with conn.cursor() as cur_set:
-            cur_set.execute("SET client_encoding TO 'UTF8';")
-        cur = conn.cursor(row_factory=psycopg.rows.dict_row)
-        from psycopg import sql
-        cols = sql.SQL(',').join(map(sql.Identifier, columns))
-        cond_sql = (
-            sql.SQL(' AND ').join(
-                sql.Composed([sql.Identifier(k), sql.SQL("=%s")])
-                for k in conditions
-            )
-            if conditions else sql.SQL("TRUE")
-        )
-        query = sql.SQL("SELECT {} FROM {} WHERE {}" ).format(
-            cols, sql.Identifier(table), cond_sql
-        )
-        cur.execute(query, tuple(conditions.values()))
-        results = cur.fetchall()
-        conn.close()
-        print("select_data returning (postgres):", results)
-        return to_serializable(results)
-    elif dbtype == 'mysql':
-        conn = _mysql_connect_with_fallback(cfg)
-        cur = conn.cursor(dictionary=True)
-        # Ensure UTF-8 for the session
-        cur.execute("SET NAMES utf8mb4;")
-        cols = ','.join(f'`{c}`' for c in columns)
-        conds = ' AND '.join(f'`{k}`=%s' for k in conditions) if conditions else '1'
-        query = f"SELECT {cols} FROM `{table}` WHERE {conds}"
-        cur.execute(query, tuple(conditions.values()))
-        results = cur.fetchall()
-        conn.close()
-        print("select_data returning (mysql):", results)
-        return to_serializable(results)
-    else:
+    select = _SELECTORS.get(dbtype)
+    if select is None:
         raise ValueError(f"Unsupported dbtype: {dbtype}")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be non-negative.")
+    _check_identifiers(db_id, cfg, table, columns, conditions)
+    results = select(db_id, cfg, table, columns, conditions, limit)
+    logger.debug("select_data returning %d rows from %s (%s)", len(results), table, dbtype)
+    return results
 
 if __name__ == "__main__":
     # mcp.run(transport="stdio")  # Or SSE for remote use
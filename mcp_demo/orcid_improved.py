@@ -1,15 +1,114 @@
 # from mcp.server.fastmcp import FastMCP
 # import requests
 from fastmcp import FastMCP
-import requests
+import asyncio
+import inspect
+import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
+from typing import Optional
 
 mcp = FastMCP("ORCID MCP Server", stateless_http=True, host="127.0.0.1", port=8001, json_response=False)
 
 ORCID_BASE = "https://pub.orcid.org/v3.0"
 HEADERS = {"Accept": "application/json"}
+REQUEST_TIMEOUT = 10
+
+# Endpoint templates, filled with % at call sites
+_URL_SEARCH = f"{ORCID_BASE}/expanded-search/"
+_URL_PROFILE = f"{ORCID_BASE}/%s"
+_URL_PERSON = f"{ORCID_BASE}/%s/person"
+_URL_WORKS = f"{ORCID_BASE}/%s/works"
+_URL_WORK = f"{ORCID_BASE}/%s/work/%s"
+
+MAX_RETRIES = 3
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Shared keep-alive client so concurrent tool calls reuse TCP/TLS connections to ORCID;
+# over HTTP/2 they multiplex on a single connection instead of queueing for sockets
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared ORCID client, creating it on first use inside the server's event loop."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=MAX_RETRIES,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+    return _client
+
+# ORCID records change rarely; keep successful lookups around instead of re-fetching them.
+# Tools all run on the server's single event loop, so the caches need no lock.
+# Slim /person results are a few KB each
+_person_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+# Whole documents (full records, raw /person data) can run to hundreds of KB each
+_record_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_works_cache: TTLCache = TTLCache(maxsize=2048, ttl=1800)
+# Validators and bodies of past 200 responses by URL, so refetches after the TTL expires
+# can be conditional GETs that ORCID answers with an empty 304; bounded by total body size
+VALIDATOR_CACHE_BYTES = 32 * 1024 * 1024
+_validators: LRUCache = LRUCache(maxsize=VALIDATOR_CACHE_BYTES, getsizeof=lambda entry: len(entry[2]) or 1)
+
+# expanded-search result fields read by search_orcid_researchers, in unpacking order
+_SEARCH_FIELDS = ("orcid-id", "given-names", "family-names", "institution-name")
+
+def _fullname(given: str, family: str) -> str:
+    """Join given and family names, skipping the separator when either is empty."""
+    return f"{given} {family}".strip() if given and family else (given or family or "").strip()
+
+def _phrase(term: str) -> str:
+    """Quote a user-supplied term as a Solr phrase so spaces, ':' or '+' can't alter the query."""
+    return '"' + term.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+async def _get(url: str, params: Optional[dict] = None, revalidate: bool = True) -> httpx.Response:
+    """GET an ORCID URL, retrying with backoff on rate limiting and gateway errors.
+    Record fetches (no query params) are revalidated with If-None-Match/If-Modified-Since when seen before;
+    pass revalidate=False when the caller caches the parsed body itself, so it is not held twice."""
+    revalidate = revalidate and params is None
+    cached = _validators.get(url) if revalidate else None
+    headers = None
+    if cached is not None:
+        headers = {}
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    for attempt in range(MAX_RETRIES + 1):
+        resp = await _get_client().get(url, params=params, headers=headers)
+        if resp.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(0.2 * 2 ** attempt)
+    if resp.status_code == 304 and cached is not None:
+        return httpx.Response(200, content=cached[2], request=resp.request)
+    if resp.status_code == 200 and revalidate:
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if (etag or last_modified) and len(resp.content) <= VALIDATOR_CACHE_BYTES:
+            _validators[url] = (etag, last_modified, resp.content)
+    return resp
+
+# Registered tool names, joined on first use (every @mcp.tool() has run by then)
+_tool_list_str: Optional[str] = None
+
+async def _tool_list() -> str:
+    global _tool_list_str
+    if _tool_list_str is None:
+        tools = mcp._tool_manager.list_tools()
+        # list_tools() is a coroutine in newer fastmcp releases
+        if inspect.isawaitable(tools):
+            tools = await tools
+        _tool_list_str = ", ".join(tool.name for tool in tools)
+    return _tool_list_str
 
 @mcp.tool()
-def connect_to_server(server_script_path: str) -> str:
+async def connect_to_server(server_script_path: str) -> str:
     """
     Connect helper placeholder for LLM clients.
 
@@ -19,11 +118,10 @@ def connect_to_server(server_script_path: str) -> str:
     Returns:
         Confirmation string with server identity and tools.
     """
-    tools = [fn for fn in mcp._tools]  # introspection
-    return f"✅ Connected to ORCID MCP Server via {server_script_path}. Tools available: {', '.join(tools)}"
+    return f"✅ Connected to ORCID MCP Server via {server_script_path}. Tools available: {await _tool_list()}"
 
 @mcp.tool()
-def search_orcid_researchers(keywords: str, limit: int = None, institution: str = None) -> dict:
+async def search_orcid_researchers(keywords: str, limit: int = None, institution: str = None) -> dict:
     """
     Search ORCID API for researchers using expanded search with name-based queries.
     Supports both keyword search and name-based search.
@@ -49,21 +147,28 @@ def search_orcid_researchers(keywords: str, limit: int = None, institution: str
             last_name = kws[1]
             
             # Build simple name-based query (no institution filtering)
-            q = f"given-names:{first_name}+AND+family-name:{last_name}"
+            q = f"given-names:{_phrase(first_name)} AND family-name:{_phrase(last_name)}"
         else:
             # Fallback to general keyword search
-            q = "+AND+".join([f"text:{kw}" for kw in kws])
+            q = " AND ".join(f"text:{_phrase(kw)}" for kw in kws)
         
-        # Use expanded search endpoint
-        url = f"{ORCID_BASE}/expanded-search/?q={q}"
-        resp = requests.get(url, headers=HEADERS)
+        # Use expanded search endpoint; httpx URL-encodes the query parameters
+        url = _URL_SEARCH
+        params = {"q": q}
+        if limit is not None and limit > 0:
+            # Let ORCID cut the page server-side too (it caps rows at 1000)
+            params["rows"] = min(limit, 1000)
+        resp = await _get(url, params=params)
         
         if resp.status_code != 200:
             return {"researchers": [], "total_found": 0, "error": f"HTTP {resp.status_code}: {resp.text}"}
         
-        data = resp.json()
-        results = data.get("expanded-result", [])
+        data = orjson.loads(resp.content)
+        results = data.get("expanded-result") or []
         total = data.get("num-found", 0)
+        # ORCID returns results ranked, so slicing first only skips rows that would be discarded
+        if limit is not None:
+            results = results[:limit]
         
         # If no results, return empty
         if not results:
@@ -71,16 +176,17 @@ def search_orcid_researchers(keywords: str, limit: int = None, institution: str
         
         researchers = []
         for item in results:
-            orcid_id = item.get("orcid-id")
+            # One C-level pass over the fields we read; missing or null fields fall back to empty values
+            orcid_id, given_names, family_names, institution_names = map(item.get, _SEARCH_FIELDS)
+            given_names = given_names or ""
+            family_names = family_names or ""
+            institution_names = institution_names or []
             
             # Extract name information
-            given_names = item.get("given-names", "")
-            family_names = item.get("family-names", "")
-            name = f"{given_names} {family_names}".strip()
+            name = _fullname(given_names, family_names)
             
             # Extract institution information
-            institution_names = item.get("institution-name", [])
-            affiliation = ", ".join(institution_names) if institution_names else ""
+            affiliation = ", ".join(institution_names)
             
             researchers.append({
                 "orcid": orcid_id,
@@ -91,112 +197,146 @@ def search_orcid_researchers(keywords: str, limit: int = None, institution: str
                 "institution_names": institution_names
             })
         
-        # Apply limit if specified
-        if limit is not None:
-            researchers = researchers[:limit]
-        
         return {"researchers": researchers, "total_found": total}
         
     except Exception as e:
         return {"researchers": [], "total_found": 0, "error": f"Search error: {str(e)}"}
 
 @mcp.tool()
-def get_researcher(orcid_id: str) -> dict:
+async def get_researcher(orcid_id: str) -> dict:
     """
     Retrieve public profile for a researcher via ORCID ID.
 
     Args:
         orcid_id: e.g., "0000-0001-2345-6789"
     """
-    url = f"{ORCID_BASE}/{orcid_id}"
-    resp = requests.get(url, headers=HEADERS)
-    return resp.json() if resp.status_code == 200 else {"error": resp.text}
+    hit = _record_cache.get(orcid_id)
+    if hit is not None:
+        return hit
+    url = _URL_PROFILE % orcid_id
+    resp = await _get(url, revalidate=False)
+    if resp.status_code != 200:
+        return {"error": resp.text}
+    record = _record_cache[orcid_id] = orjson.loads(resp.content)
+    return record
 
-@mcp.tool()
-def get_person_details(orcid_id: str) -> dict:
-    """
-    Retrieve personal information section for a researcher including external identifiers,
-    researcher URLs, and other personal details.
+def _items(data: dict, section: str, field: str) -> list:
+    """Return data[section][field] from an ORCID /person document, or [] when either level is missing or null."""
+    return (data.get(section) or {}).get(field) or []
 
-    Args:
-        orcid_id: e.g., "0000-0001-2345-6789"
-        
-    Returns:
-        Personal information including external identifiers (Scopus ID, etc.),
-        researcher URLs (LinkedIn, etc.), email, biography, keywords, and addresses
-    """
+def _value(node: Optional[dict]) -> Optional[str]:
+    """Unwrap ORCID's {"value": ...} leaf nodes."""
+    return node.get("value") if node else None
+
+async def _fetch_person(orcid_id: str, include_raw: bool = False) -> dict:
+    """Fetch and flatten the /person section for one ORCID ID."""
+    # Slim and raw results are cached apart so the default path never holds whole documents
+    cache = _record_cache if include_raw else _person_cache
+    key = ("person", orcid_id, include_raw)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
     try:
-        url = f"{ORCID_BASE}/{orcid_id}/person"
-        resp = requests.get(url, headers=HEADERS)
+        url = _URL_PERSON % orcid_id
+        resp = await _get(url)
         
         if resp.status_code != 200:
             return {"error": f"HTTP {resp.status_code}: {resp.text}"}
         
-        data = resp.json()
+        data = orjson.loads(resp.content)
         
+        # Walk straight to the handful of subtrees we return instead of probing each level twice
         # Extract external identifiers (Scopus, SciProfiles, etc.)
-        external_ids = []
-        if "external-identifiers" in data and "external-identifier" in data["external-identifiers"]:
-            for ext_id in data["external-identifiers"]["external-identifier"]:
-                external_ids.append({
-                    "type": ext_id.get("external-id-type"),
-                    "value": ext_id.get("external-id-value"),
-                    "url": ext_id.get("external-id-url", {}).get("value") if ext_id.get("external-id-url") else None
-                })
+        external_ids = [
+            {
+                "type": ext_id.get("external-id-type"),
+                "value": ext_id.get("external-id-value"),
+                "url": _value(ext_id.get("external-id-url"))
+            }
+            for ext_id in _items(data, "external-identifiers", "external-identifier")
+        ]
         
         # Extract researcher URLs (LinkedIn, personal websites, etc.)
-        researcher_urls = []
-        if "researcher-urls" in data and "researcher-url" in data["researcher-urls"]:
-            for url_item in data["researcher-urls"]["researcher-url"]:
-                researcher_urls.append({
-                    "name": url_item.get("url-name", {}).get("value") if url_item.get("url-name") else None,
-                    "url": url_item.get("url", {}).get("value") if url_item.get("url") else None
-                })
+        researcher_urls = [
+            {"name": _value(url_item.get("url-name")), "url": _value(url_item.get("url"))}
+            for url_item in _items(data, "researcher-urls", "researcher-url")
+        ]
         
         # Extract basic personal info
-        name_info = data.get("name", {})
-        given_names = name_info.get("given-names", {}).get("value") if name_info.get("given-names") else ""
-        family_name = name_info.get("family-name", {}).get("value") if name_info.get("family-name") else ""
+        name_info = data.get("name") or {}
+        given_names = _value(name_info.get("given-names")) or ""
+        family_name = _value(name_info.get("family-name")) or ""
         
         # Extract keywords
-        keywords = []
-        if "keywords" in data and "keyword" in data["keywords"]:
-            for keyword in data["keywords"]["keyword"]:
-                if keyword.get("content"):
-                    keywords.append(keyword["content"])
+        keywords = [k["content"] for k in _items(data, "keywords", "keyword") if k.get("content")]
         
         # Extract biography
-        biography = None
-        if "biography" in data and data["biography"] and "content" in data["biography"]:
-            biography = data["biography"]["content"]
+        biography = (data.get("biography") or {}).get("content")
         
         # Extract emails (usually empty due to privacy)
-        emails = []
-        if "emails" in data and "email" in data["emails"]:
-            for email in data["emails"]["email"]:
-                if email.get("email"):
-                    emails.append(email["email"])
+        emails = [e["email"] for e in _items(data, "emails", "email") if e.get("email")]
         
-        return {
+        person = {
             "orcid_id": orcid_id,
             "given_names": given_names,
             "family_name": family_name,
-            "full_name": f"{given_names} {family_name}".strip(),
+            "full_name": _fullname(given_names, family_name),
             "biography": biography,
             "keywords": keywords,
             "emails": emails,
             "external_identifiers": external_ids,
-            "researcher_urls": researcher_urls,
-            "raw_data": data
+            "researcher_urls": researcher_urls
         }
+        if include_raw:
+            person["raw_data"] = data
+        cache[key] = person
+        return person
         
     except Exception as e:
         return {"error": f"Failed to fetch person details: {str(e)}"}
+
+@mcp.tool()
+async def get_person_details(orcid_id: str, include_raw: bool = False) -> dict:
+    """
+    Retrieve personal information section for a researcher including external identifiers,
+    researcher URLs, and other personal details.
+
+    Args:
+        orcid_id: e.g., "0000-0001-2345-6789"
+        include_raw: also return the full ORCID /person document as raw_data
         
-    return resp.json() if resp.status_code == 200 else {"error": resp.text}
+    Returns:
+        Personal information including external identifiers (Scopus ID, etc.),
+        researcher URLs (LinkedIn, etc.), email, biography, keywords, and addresses
+    """
+    return await _fetch_person(orcid_id, include_raw)
+
+@mcp.tool()
+async def get_many_persons(orcid_ids: list[str], include_raw: bool = False) -> list[dict]:
+    """
+    Retrieve personal information for several researchers in one call, fetching concurrently.
+
+    Args:
+        orcid_ids: list of ORCID IDs
+        include_raw: also return each full ORCID /person document as raw_data
+
+    Returns:
+        One get_person_details result per ORCID ID, in the same order
+    """
+    # Repeated IDs are fetched once
+    unique_ids = list(dict.fromkeys(orcid_ids))
+    results = await asyncio.gather(
+        *[_fetch_person(orcid_id, include_raw) for orcid_id in unique_ids],
+        return_exceptions=True
+    )
+    by_id = {
+        orcid_id: {"orcid_id": orcid_id, "error": f"Failed to fetch person details: {r}"} if isinstance(r, BaseException) else r
+        for orcid_id, r in zip(unique_ids, results)
+    }
+    return [by_id[orcid_id] for orcid_id in orcid_ids]
 
 @mcp.tool()
-def get_works(orcid_id: str, limit: int = 10) -> dict:
+async def get_works(orcid_id: str, limit: int = 10) -> dict:
     """
     Fetch public works summaries for a researcher.
 
@@ -204,11 +344,11 @@ def get_works(orcid_id: str, limit: int = 10) -> dict:
         orcid_id: ORCID ID
         limit: number of works to return
     """
-    url = f"{ORCID_BASE}/{orcid_id}/works"
-    resp = requests.get(url, headers=HEADERS)
+    url = _URL_WORKS % orcid_id
+    resp = await _get(url)
     if resp.status_code != 200:
         return {"works": [], "error": resp.text}
-    groups = resp.json().get("group", [])
+    groups = orjson.loads(resp.content).get("group", [])
     works = []
     for g in groups[:limit]:
         w = g["work-summary"][0]
@@ -220,7 +360,7 @@ def get_works(orcid_id: str, limit: int = 10) -> dict:
     return {"works": works}
 
 @mcp.tool()
-def get_work_detail(orcid_id: str, put_code: int) -> dict:
+async def get_work_detail(orcid_id: str, put_code: int) -> dict:
     """
     Get full metadata for a particular work.
 
@@ -228,9 +368,16 @@ def get_work_detail(orcid_id: str, put_code: int) -> dict:
         orcid_id: ORCID ID
         put_code: work identifier code
     """
-    url = f"{ORCID_BASE}/{orcid_id}/work/{put_code}"
-    resp = requests.get(url, headers=HEADERS)
-    return resp.json() if resp.status_code == 200 else {"error": resp.text}
+    key = (orcid_id, put_code)
+    hit = _works_cache.get(key)
+    if hit is not None:
+        return hit
+    url = _URL_WORK % (orcid_id, put_code)
+    resp = await _get(url, revalidate=False)
+    if resp.status_code != 200:
+        return {"error": resp.text}
+    work = _works_cache[key] = orjson.loads(resp.content)
+    return work
 
 if __name__ == "__main__":
     mcp.streamable_http_app()
@@ -11,6 +11,9 @@ load_dotenv()
 # MCP Server Configuration
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8017/mcp")
 
+# Backend v2 API (researcher records)
+BACKEND_V2_URL = os.getenv("BACKEND_V2_URL", "http://backend-v2:8020")
+
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:a@localhost:5432/results")
 
@@ -25,5 +28,8 @@ BACKEND_CORS_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS", "*")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gpt-4")
 
+# Startup Configuration (seconds allowed per startup task)
+STARTUP_TASK_TIMEOUT = float(os.getenv("STARTUP_TASK_TIMEOUT", "30"))
+
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
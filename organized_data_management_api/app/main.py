@@ -5,6 +5,8 @@ Main FastAPI application
 import os
 import asyncio
 import logging
+import httpx
+import litellm
 from datetime import datetime
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -14,10 +16,13 @@ from fastapi.middleware.cors import CORSMiddleware
 os.environ["OPENAI_API_TRACING"] = "false"
 
 from .core.config import (
-    PROJECT_NAME, BACKEND_CORS_ORIGINS, LOG_LEVEL
+    PROJECT_NAME, BACKEND_CORS_ORIGINS, LOG_LEVEL, STARTUP_TASK_TIMEOUT, BACKEND_V2_URL
 )
-from .services.mcp_service import initialize_mcp_servers, sync_databases_from_mcp
+from .services.mcp_service import initialize_mcp_servers, sync_databases_from_mcp, close_mcp_client
 from .services.agent_service import initialize_orcid_server
+from .routes.chat import (
+    initialize_orcid_server as initialize_chat_orcid_server, reconcile_orcid_server
+)
 import os
 from .routes import database, orcid, tasks, system, chat
 
@@ -32,42 +37,86 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Research Database Management API...")
     
-    # Try to initialize MCP servers on startup, but don't fail if they're not ready
-    try:
-        await initialize_mcp_servers()
-        logger.info("MCP servers initialized successfully")
-    except Exception as e:
-        logger.warning(f"Failed to initialize MCP servers on startup: {e}")
-        logger.info("MCP servers will be initialized on first use")
+    # One pooled client for calls to backend v2, so requests reuse keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        base_url=BACKEND_V2_URL,
+        limits=httpx.Limits(max_connections=2000, max_keepalive_connections=1500),
+        timeout=httpx.Timeout(30.0)
+    )
+    
+    # Shared pooled client for LiteLLM's provider calls, so concurrent chats reuse
+    # connections instead of hitting the default pool limits
+    litellm.aclient_session = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=2200, max_keepalive_connections=2000),
+        timeout=httpx.Timeout(120.0)
+    )
+    
+    # Startup tasks are independent and network-bound, so run them concurrently,
+    # each bounded by STARTUP_TASK_TIMEOUT; none of them is allowed to fail startup
+    startup_tasks = [(
+        initialize_mcp_servers(),
+        "MCP servers initialized successfully",
+        "Failed to initialize MCP servers on startup",
+        "MCP servers will be initialized on first use",
+    )]
     
     # Optionally initialize ORCID server (can be disabled to avoid startup failure)
     enable_orcid = os.getenv("ENABLE_ORCID_INIT", "false").lower() in {"1", "true", "yes"}
     if enable_orcid:
-        try:
-            await initialize_orcid_server()
-            logger.info("ORCID server initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize ORCID server on startup: {e}")
-            logger.info("ORCID server will be initialized on first use")
+        startup_tasks.append((
+            initialize_orcid_server(),
+            "ORCID server initialized successfully",
+            "Failed to initialize ORCID server on startup",
+            "ORCID server will be initialized on first use",
+        ))
+        # Connect the chat assistant's ORCID server too, so the first chat doesn't pay the handshake
+        startup_tasks.append((
+            initialize_chat_orcid_server(),
+            "Chat ORCID server initialized successfully",
+            "Failed to initialize chat ORCID server on startup",
+            "Chat ORCID server will be initialized on first chat",
+        ))
     else:
         logger.info("Skipping ORCID initialization on startup (ENABLE_ORCID_INIT is false)")
     
     # Optionally sync databases from MCP server on startup
     enable_sync = os.getenv("ENABLE_MCP_SYNC_ON_START", "false").lower() in {"1", "true", "yes"}
     if enable_sync:
-        try:
-            await sync_databases_from_mcp()
-            logger.info("Database sync completed successfully")
-        except Exception as e:
-            logger.warning(f"Failed to sync databases on startup: {e}")
-            logger.info("Databases will be synced on first request")
+        startup_tasks.append((
+            sync_databases_from_mcp(),
+            "Database sync completed successfully",
+            "Failed to sync databases on startup",
+            "Databases will be synced on first request",
+        ))
     else:
         logger.info("Skipping database sync on startup (ENABLE_MCP_SYNC_ON_START is false)")
     
+    results = await asyncio.gather(
+        *(asyncio.wait_for(task, STARTUP_TASK_TIMEOUT) for task, _, _, _ in startup_tasks),
+        return_exceptions=True
+    )
+    for (_, success_msg, failure_msg, fallback_msg), result in zip(startup_tasks, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"{failure_msg}: {result!r}")
+            logger.info(fallback_msg)
+        else:
+            logger.info(success_msg)
+    
+    # If the chat ORCID connect failed or timed out, keep retrying in the background
+    # so reconnecting doesn't depend on chat or health-check traffic
+    orcid_reconciler = asyncio.create_task(reconcile_orcid_server()) if enable_orcid else None
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Research Database Management API...")
+    if orcid_reconciler is not None:
+        orcid_reconciler.cancel()
+    await app.state.http.aclose()
+    await litellm.aclient_session.aclose()
+    litellm.aclient_session = None
+    await close_mcp_client()
 
 
 # Create FastAPI app
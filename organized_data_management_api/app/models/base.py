@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class TableInfo:
     name: str
     columns: Dict[str, str]
@@ -7,6 +7,23 @@ from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
 
+# Synonyms accepted for dbtype/type fields
+_DBTYPE_ALIASES = {'postgresql': 'postgres', 'pg': 'postgres', 'mariadb': 'mysql'}
+_CONNECTION_DBTYPES = ('postgres', 'mysql', 'sqlite', 'mongodb')
+_MCP_DBTYPES = ('postgres', 'mysql')
+_CONNECTION_DBTYPE_SET = frozenset(_CONNECTION_DBTYPES)
+_MCP_DBTYPE_SET = frozenset(_MCP_DBTYPES)
+
+
+def _normalize_dbtype(v: Optional[str], allowed: frozenset, allowed_names: tuple) -> str:
+    """Lowercase, resolve synonyms and check a database type against the allowed set"""
+    val = (v or '').strip().lower()
+    val = _DBTYPE_ALIASES.get(val, val)
+    if val not in allowed:
+        raise ValueError(f'Database type must be one of: {list(allowed_names)}')
+    return val
+
+
 class DatabaseConnectionRequest(BaseModel):
     id: Optional[str] = Field(None, description="Unique identifier for the database connection (optional, will be assigned by MCP server)")
     name: str = Field(..., description="Display name for the connection")
@@ -31,16 +48,7 @@ class DatabaseConnectionRequest(BaseModel):
     @field_validator('dbtype')
     @classmethod
     def validate_dbtype(cls, v):
-        val = (v or '').strip().lower()
-        # Normalize common synonyms
-        if val in ['postgresql', 'pg']: 
-            val = 'postgres'
-        if val in ['mariadb']: 
-            val = 'mysql'
-        allowed_types = ['postgres', 'mysql', 'sqlite', 'mongodb']
-        if val not in allowed_types:
-            raise ValueError(f'Database type must be one of: {allowed_types}')
-        return val
+        return _normalize_dbtype(v, _CONNECTION_DBTYPE_SET, _CONNECTION_DBTYPES)
 
 
 class DatabaseConnectionResponse(BaseModel):
@@ -79,15 +87,7 @@ class SimpleDatabaseCreate(BaseModel):
     @field_validator('type')
     @classmethod
     def validate_type(cls, v):
-        val = (v or '').strip().lower()
-        if val in ['postgresql', 'pg']:
-            val = 'postgres'
-        if val in ['mariadb']:
-            val = 'mysql'
-        allowed_types = ['postgres', 'mysql']
-        if val not in allowed_types:
-            raise ValueError(f'Database type must be one of: {allowed_types}')
-        return val
+        return _normalize_dbtype(v, _MCP_DBTYPE_SET, _MCP_DBTYPES)
 
 
 class FrontendDatabaseCreate(BaseModel):
@@ -105,10 +105,7 @@ class FrontendDatabaseCreate(BaseModel):
     @field_validator('dbtype')
     @classmethod
     def validate_dbtype(cls, v):
-        allowed_types = ['postgres', 'mysql']
-        if v.lower() not in allowed_types:
-            raise ValueError(f'Database type must be one of: {allowed_types}')
-        return v.lower()
+        return _normalize_dbtype(v, _MCP_DBTYPE_SET, _MCP_DBTYPES)
     
     def to_simple_database_create(self) -> SimpleDatabaseCreate:
         """Convert to SimpleDatabaseCreate format"""
@@ -2,11 +2,16 @@
 ORCID-related models
 """
 
+import re
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from .base import LLMConfig
 
 
+# db_id strings: "1" or "db_1"
+_DB_ID_RE = re.compile(r"(?:db_)?(\d+)")
+
+
 class ORCIDSearchRequest(BaseModel):
     researchers: List[Dict[str, str]] = Field(..., description="List of researchers with name/affiliation")
     limit_per_researcher: int = Field(10, ge=1, le=50, description="Max ORCID results per researcher")
@@ -38,12 +43,10 @@ class ORCIDTableSearchRequest(BaseModel):
     def coerce_db_id(cls, v):
         # Accept int, numeric strings, or strings like "db_1"
         if isinstance(v, str):
-            if v.startswith('db_'):
-                return int(v[3:])
-            try:
-                return int(v)
-            except ValueError:
+            m = _DB_ID_RE.fullmatch(v.strip())
+            if m is None:
                 raise ValueError(f'Invalid db_id format: {v}')
+            return int(m.group(1))
         return int(v)
 
 
@@ -80,6 +83,8 @@ class ResearcherInfoTable(BaseModel):
 
 
 class CandidateScore(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     source_result_index: int
     orcid_id: Optional[str] = None
     first_name: Optional[str] = None
@@ -116,6 +121,8 @@ class ORCIDTableSearchRequest_v2(BaseModel):
 
 
 class OrcidSearchResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     orcid_id: Optional[str] = Field(None, description="The researcher's ORCID ID")
     first_name: Optional[str] = None
     last_name: Optional[str] = None
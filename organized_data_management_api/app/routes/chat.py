@@ -4,27 +4,77 @@ Chat endpoints for AI assistant interaction using OpenAI Agents SDK
 
 import os
 import json
+import time
 import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Tuple, Callable, Awaitable
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 # Disable OpenAI tracing to prevent API key warnings
 os.environ["OPENAI_API_TRACING"] = "false"
 
+import orjson
+import litellm
 from agents import Agent, Runner
 from agents.extensions.models.litellm_model import LitellmModel
 from agents.mcp import MCPServerStreamableHttp
+from openai.types.responses import ResponseTextDeltaEvent
 
 from ..utils.helpers import get_llm_config_from_model_name
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["chat"])
+router = APIRouter(prefix="/api/v1", tags=["chat"], default_response_class=ORJSONResponse)
 
 # Global MCP server instance
 orcid_server = None
+_orcid_init_lock = asyncio.Lock()
+
+# Agents are immutable configuration, so one instance per (model, API key hash, ORCID server)
+# serves every request; bounded so rotated keys don't accumulate
+AGENT_CACHE_MAX_ENTRIES = 64
+_agent_cache: Dict[Tuple[str, str, int], Agent] = {}
+_runner = Runner()
+
+# Admission control for LLM runs: at most CHAT_MAX_CONCURRENCY run at once, and once
+# CHAT_MAX_QUEUED more are waiting for a slot new chats get 429 instead of queueing unboundedly
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "32"))
+CHAT_MAX_QUEUED = int(os.getenv("CHAT_MAX_QUEUED", "128"))
+_chat_slots = asyncio.Semaphore(CHAT_MAX_CONCURRENCY)
+_chat_waiting = 0
+_chat_running = 0
+
+# Frontend model names that LiteLLM knows under a provider-prefixed name
+LITELLM_MODEL_MAP = {
+    "gemini-2.5-pro": "gemini/gemini-2.5-pro",
+    "gemini-2.5-flash": "gemini/gemini-2.5-flash",
+}
+
+# Models offered to the frontend; the /models payload never changes so it is serialized once
+AVAILABLE_MODELS = (
+    {"id": "gpt-4o", "name": "GPT-4o", "provider": "OpenAI"},
+    {"id": "gpt-4o-mini", "name": "GPT-4o Mini", "provider": "OpenAI"},
+    {"id": "gpt-4-turbo", "name": "GPT-4 Turbo", "provider": "OpenAI"},
+    {"id": "gemini-1.5-pro", "name": "Gemini 1.5 Pro", "provider": "Google"},
+    {"id": "gemini-1.5-flash", "name": "Gemini 1.5 Flash", "provider": "Google"},
+    {"id": "deepseek/deepseek-chat", "name": "DeepSeek Chat", "provider": "DeepSeek"},
+    {"id": "deepseek/deepseek-reasoner", "name": "DeepSeek Reasoner", "provider": "DeepSeek"},
+)
+AVAILABLE_MODEL_IDS = [m["id"] for m in AVAILABLE_MODELS]
+_MODELS_JSON = orjson.dumps({"models": AVAILABLE_MODELS})
+
+# Answers to stateless chat turns keyed by model + normalized message: key -> (expires_at, response)
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "600"))
+CHAT_CACHE_MAX_ENTRIES = 1024
+_chat_cache: Dict[str, Tuple[float, str]] = {}
+# Chat turns currently being answered, by the same key: followers await the leader's future
+_inflight: Dict[str, asyncio.Future] = {}
 
 class ChatRequest(BaseModel):
     message: str
@@ -50,89 +100,324 @@ async def initialize_orcid_server():
     if orcid_server is not None:
         return orcid_server
     
-    try:
-        print("🔧 Initializing ORCID MCP server for chat...")
-        import os
-        orcid_url = os.getenv("MCP_ORCID_SERVER_URL", "http://orcid-mcp:8001/mcp")
-        
-        orcid_server = MCPServerStreamableHttp(
-            name="ORCID Chat Server",
-            params={"url": orcid_url, "timeout": 60},  # Increased timeout
-            cache_tools_list=True
-        )
-        
-        # Connect the server
-        await orcid_server.connect()
-        print("✅ ORCID MCP server initialized for chat successfully")
-        
-        return orcid_server
-        
-    except Exception as e:
-        print(f"❌ Failed to initialize ORCID MCP server for chat: {e}")
+    # Concurrent cold-start requests wait for one connect instead of each opening a server
+    async with _orcid_init_lock:
+        if orcid_server is not None:
+            return orcid_server
+        try:
+            logger.debug("Initializing ORCID MCP server for chat...")
+            orcid_url = os.getenv("MCP_ORCID_SERVER_URL", "http://orcid-mcp:8001/mcp")
+            
+            server = MCPServerStreamableHttp(
+                name="ORCID Chat Server",
+                params={"url": orcid_url, "timeout": 60},  # Increased timeout
+                cache_tools_list=True
+            )
+            
+            # Connect the server; only publish it once connected
+            await server.connect()
+            orcid_server = server
+            logger.info("ORCID MCP server initialized for chat successfully")
+            
+            return orcid_server
+            
+        except Exception as e:
+            logger.warning("Failed to initialize ORCID MCP server for chat: %s", e)
+            return None
+
+async def reconcile_orcid_server(initial_delay: float = 1.0, max_delay: float = 60.0):
+    """Keep retrying the ORCID MCP connection with exponential backoff until it is up"""
+    delay = initial_delay
+    while await initialize_orcid_server() is None:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+class AsyncTTLCache:
+    """Tiny bounded async TTL cache; concurrent misses for one key share a single load"""
+    
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.d: Dict[str, Tuple[float, Any]] = {}
+        # Loads in progress; entries only live while their load runs, so client-chosen
+        # keys (e.g. arbitrary model names) can't accumulate here
+        self._loading: Dict[str, asyncio.Task] = {}
+    
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self.d.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
         return None
+    
+    def _set(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        if key not in self.d and len(self.d) >= self.maxsize:
+            for stale in [k for k, (expires_at, _) in self.d.items() if expires_at <= now]:
+                del self.d[stale]
+            if len(self.d) >= self.maxsize:
+                # Dicts keep insertion order, so this drops the oldest entry
+                self.d.pop(next(iter(self.d)), None)
+        self.d[key] = (now + self.ttl, value)
+    
+    async def get_or_set(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._get(key)
+        if value is not None:
+            return value
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.ensure_future(coro_factory())
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        value = await asyncio.shield(task)
+        # None means "not found"; don't pin a miss for the whole TTL
+        if value is not None:
+            self._set(key, value)
+        return value
+    
+    def invalidate(self, key: str) -> None:
+        self.d.pop(key, None)
+
+
+# API keys rotate on the order of hours; resolve each model's key at most every API_KEY_CACHE_TTL seconds
+API_KEY_CACHE_TTL = float(os.getenv("CHAT_API_KEY_CACHE_TTL", "300"))
+_api_key_cache = AsyncTTLCache(API_KEY_CACHE_TTL)
 
-# Removed complex agent creation function - now done directly in endpoint
 
 async def get_api_key_for_model(model_name: str) -> Optional[str]:
+    """Get API key for the specified model, served from a short TTL cache"""
+    return await _api_key_cache.get_or_set(model_name, lambda: _fetch_api_key_for_model(model_name))
+
+
+async def _fetch_api_key_for_model(model_name: str) -> Optional[str]:
     """Get API key for the specified model using the same method as ORCID"""
     try:
         llm_config = await get_llm_config_from_model_name(model_name)
         if llm_config and llm_config.api_key:
-            print(f"✅ Retrieved API key for {model_name}: {llm_config.api_key[:15]}...{llm_config.api_key[-10:] if llm_config.api_key else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Retrieved API key for %s: %s...%s", model_name, llm_config.api_key[:15], llm_config.api_key[-10:])
             return llm_config.api_key
         else:
-            print(f"❌ No API key found for model: {model_name}")
+            logger.warning("No API key found for model: %s", model_name)
             return None
     except Exception as e:
-        print(f"💥 Error getting API key for {model_name}: {e}")
+        logger.error("Error getting API key for %s: %s", model_name, e)
         return None
 
 
+def _get_agent(model_name: str, api_key: str) -> Agent:
+    """Return the research assistant agent for this model/key, reusing a warm instance when possible"""
+    key = (model_name, hashlib.sha1(api_key.encode()).hexdigest(), id(orcid_server))
+    agent = _agent_cache.get(key)
+    if agent is None:
+        if len(_agent_cache) >= AGENT_CACHE_MAX_ENTRIES:
+            _agent_cache.pop(next(iter(_agent_cache)), None)
+        agent = _agent_cache[key] = _build_agent(model_name, api_key)
+    return agent
+
+
+def _build_agent(model_name: str, api_key: str) -> Agent:
+    """Create the research assistant agent backed by the ORCID server"""
+    # Other models (OpenAI, DeepSeek, etc.) keep their frontend name
+    litellm_model_name = LITELLM_MODEL_MAP.get(model_name, model_name)
+    
+    # Create agent with ORCID server
+    return Agent(
+        name="research_assistant",
+        instructions="You are a research assistant with access to ORCID database. Help users find researchers, analyze profiles, and provide research guidance.",
+        mcp_servers=[orcid_server],
+        model=LitellmModel(model=litellm_model_name, api_key=api_key)
+    )
+
+
+def _chat_cache_key(request: "ChatRequest") -> Optional[str]:
+    """Cache key for a chat turn, or None when the turn carries history and must not be cached"""
+    if request.history:
+        return None
+    normalized = " ".join(request.message.split()).lower()
+    return hashlib.sha256(f"{request.model_name}||{normalized}".encode()).hexdigest()
+
+
+def _chat_cache_get(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    entry = _chat_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _chat_cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def _chat_cache_set(key: Optional[str], response_text: str) -> None:
+    if key is None or not response_text:
+        return
+    if len(_chat_cache) >= CHAT_CACHE_MAX_ENTRIES:
+        # Dicts keep insertion order, so this drops the oldest entry
+        _chat_cache.pop(next(iter(_chat_cache)), None)
+    _chat_cache[key] = (time.monotonic() + CHAT_CACHE_TTL, response_text)
+
+
+def _check_chat_admission() -> None:
+    if _chat_waiting >= CHAT_MAX_QUEUED:
+        raise HTTPException(status_code=429, detail="Too many chat requests in progress, please retry shortly")
+
+
+@asynccontextmanager
+async def _chat_slot():
+    """Hold one of the CHAT_MAX_CONCURRENCY LLM run slots"""
+    global _chat_waiting, _chat_running
+    _check_chat_admission()
+    _chat_waiting += 1
+    try:
+        await _chat_slots.acquire()
+    finally:
+        _chat_waiting -= 1
+    _chat_running += 1
+    try:
+        yield
+    finally:
+        _chat_running -= 1
+        _chat_slots.release()
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one Server-Sent Events message"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def _stream_chat(agent: Agent, message: str, model_name: str, cache_key: Optional[str] = None):
+    """Yield the agent's text deltas as SSE, then a final 'done' event carrying the full response"""
+    try:
+        async with _chat_slot():
+            for attempt in range(2):
+                result = Runner.run_streamed(agent, message)
+                streamed = False
+                try:
+                    async for event in result.stream_events():
+                        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                            streamed = True
+                            yield _sse({"delta": event.data.delta})
+                    break
+                except litellm.AuthenticationError:
+                    # The cached key may have been rotated; refetch it and retry once, like the
+                    # JSON path, unless deltas already went out and a rerun would repeat them
+                    _api_key_cache.invalidate(model_name)
+                    if attempt or streamed:
+                        raise
+                    api_key = await get_api_key_for_model(model_name)
+                    if not api_key:
+                        raise
+                    agent = _get_agent(model_name, api_key)
+        response_text = str(result.final_output) if result.final_output else ""
+        _chat_cache_set(cache_key, response_text)
+        yield _sse({"response": response_text, "model_name": model_name, "status": "success"}, event="done")
+    except Exception as e:
+        logger.error("Chat stream error: %s", e)
+        yield _sse({"detail": str(e)}, event="error")
+
+
+async def _prepare_agent(model_name: str) -> Agent:
+    """Connect the ORCID server if needed, resolve the API key and return the agent for model_name"""
+    # Initialize ORCID server
+    await initialize_orcid_server()
+    if orcid_server is None:
+        raise HTTPException(status_code=500, detail="ORCID server not available")
+    
+    # Get API key from backend
+    api_key = await get_api_key_for_model(model_name)
+    if not api_key:
+        raise HTTPException(status_code=400, detail=f"No API key found for model: {model_name}")
+    
+    return _get_agent(model_name, api_key)
+
+
+async def _run_chat(request: ChatRequest, cache_key: Optional[str]) -> str:
+    """Run one chat turn to completion and return the response text"""
+    agent = await _prepare_agent(request.model_name)
+    
+    # Run agent and return output directly
+    async with _chat_slot():
+        try:
+            result = await _runner.run(agent, request.message)
+        except litellm.AuthenticationError:
+            # The cached key may have been rotated; refetch it and retry once
+            _api_key_cache.invalidate(request.model_name)
+            api_key = await get_api_key_for_model(request.model_name)
+            if not api_key:
+                raise
+            result = await _runner.run(_get_agent(request.model_name, api_key), request.message)
+    
+    # Extract just the final output from the RunResult
+    if hasattr(result, 'final_output') and result.final_output:
+        response_text = str(result.final_output)
+    elif hasattr(result, 'content'):
+        response_text = result.content
+    else:
+        response_text = str(result)
+    _chat_cache_set(cache_key, response_text)
+    return response_text
+
+
+async def _single_flight(key: Optional[str], factory: Callable[[], Awaitable[str]]) -> str:
+    """Run factory() once per key at a time; identical concurrent callers await the same result"""
+    if key is None:
+        return await factory()
+    fut = _inflight.get(key)
+    if fut is not None:
+        # shield: one follower disconnecting must not cancel the shared run
+        return await asyncio.shield(fut)
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await factory()
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved so a follower-less failure isn't logged twice
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
 @router.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
+async def chat_endpoint(
+    request: ChatRequest,
+    stream: bool = Query(False, description="Stream tokens as Server-Sent Events instead of one JSON response")
+):
     """Simple chat endpoint for AI assistant using ORCID server"""
     try:
-        # Initialize ORCID server
-        await initialize_orcid_server()
-        if orcid_server is None:
-            raise HTTPException(status_code=500, detail="ORCID server not available")
-        
-        # Get API key from backend
-        api_key = await get_api_key_for_model(request.model_name)
-        if not api_key:
-            raise HTTPException(status_code=400, detail=f"No API key found for model: {request.model_name}")
-        
-        # Map model name for LiteLLM compatibility
-        def get_litellm_model_name(model_name: str) -> str:
-            """Map frontend model names to LiteLLM compatible names"""
-            if model_name == "gemini-2.5-pro":
-                return "gemini/gemini-2.5-pro"
-            elif model_name == "gemini-2.5-flash":
-                return "gemini/gemini-2.5-flash"
-            else:
-                return model_name  # Keep original for OpenAI, DeepSeek, etc.
+        # Repeated stateless questions are answered from cache without touching the LLM
+        cache_key = _chat_cache_key(request)
+        cached = _chat_cache_get(cache_key)
+        if cached is not None:
+            if stream:
+                return StreamingResponse(
+                    iter([_sse({"response": cached, "model_name": request.model_name, "status": "success"}, event="done")]),
+                    media_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+                )
+            return ChatResponse(response=cached, model_name=request.model_name, status="success")
         
-        litellm_model_name = get_litellm_model_name(request.model_name)
+        # Shed load before doing any work when too many chats are already waiting
+        _check_chat_admission()
         
-        # Create agent with ORCID server
-        agent = Agent(
-            name="research_assistant",
-            instructions="You are a research assistant with access to ORCID database. Help users find researchers, analyze profiles, and provide research guidance.",
-            mcp_servers=[orcid_server],
-            model=LitellmModel(model=litellm_model_name, api_key=api_key)
-        )
+        if stream:
+            agent = await _prepare_agent(request.model_name)
+            # Tokens reach the client as the model produces them; no-cache/X-Accel-Buffering keep proxies from buffering
+            return StreamingResponse(
+                _stream_chat(agent, request.message, request.model_name, cache_key),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         
-        # Run agent and return output directly
-        runner = Runner()
-        result = await runner.run(agent, request.message)
-        
-        # Extract just the final output from the RunResult
-        if hasattr(result, 'final_output') and result.final_output:
-            response_text = str(result.final_output)
-        elif hasattr(result, 'content'):
-            response_text = result.content
-        else:
-            response_text = str(result)
+        # Identical stateless questions already being answered share that run
+        response_text = await _single_flight(cache_key, lambda: _run_chat(request, cache_key))
         
         return ChatResponse(
             response=response_text,
@@ -140,122 +425,146 @@ async def chat_endpoint(request: ChatRequest):
             status="success"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Chat error: {e}")
+        logger.error("Chat error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/chat/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(background_tasks: BackgroundTasks):
     """Health check for the chat service"""
-    try:
-        # Check ORCID server connection
-        orcid_connected = orcid_server is not None
-        
-        if not orcid_connected:
-            # Try to initialize
-            await initialize_orcid_server()
-            orcid_connected = orcid_server is not None
-        
-        # List of supported models (you can expand this)
-        available_models = [
-            "gpt-4o",
-            "gpt-4o-mini", 
-            "gpt-4-turbo",
-            "gemini-1.5-pro",
-            "gemini-1.5-flash",
-            "deepseek/deepseek-chat",
-            "deepseek/deepseek-reasoner"
-        ]
-        
-        return HealthResponse(
-            status="healthy" if orcid_connected else "degraded",
-            orcid_server_connected=orcid_connected,
-            available_models=available_models
-        )
-        
-    except Exception as e:
-        print(f"Health check error: {e}")
-        return HealthResponse(
-            status="unhealthy",
-            orcid_server_connected=False,
-            available_models=[]
-        )
+    # Report the current state right away; a reconnect (up to the MCP timeout) must not
+    # hold up the probe, so it is scheduled after the response unless one is already running
+    orcid_connected = orcid_server is not None
+    if not orcid_connected and not _orcid_init_lock.locked():
+        background_tasks.add_task(initialize_orcid_server)
+    
+    return HealthResponse(
+        status="healthy" if orcid_connected else "degraded",
+        orcid_server_connected=orcid_connected,
+        available_models=AVAILABLE_MODEL_IDS
+    )
+
+@router.get("/metrics")
+async def chat_metrics():
+    """In-flight chat load, for monitoring admission control"""
+    return {
+        "chats_running": _chat_running,
+        "chats_queued": _chat_waiting,
+        "max_concurrency": CHAT_MAX_CONCURRENCY,
+        "max_queued": CHAT_MAX_QUEUED,
+        "single_flight_keys": len(_inflight),
+        "cached_responses": len(_chat_cache)
+    }
 
 @router.post("/models")
 async def list_available_models():
     """List available AI models"""
+    return Response(content=_MODELS_JSON, media_type="application/json")
+
+# Add endpoints for the assistant page
+# Backend v2 researcher listing (ordered by id; keyset-paginated with after_id/limit)
+RESEARCHERS_PATH = "/api/v1/chercheurs/"
+RESEARCHERS_PAGE_SIZE = 500
+
+
+def _assistant_researcher(researcher: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform a backend researcher record to the format expected by the assistant"""
     return {
-        "models": [
-            {"id": "gpt-4o", "name": "GPT-4o", "provider": "OpenAI"},
-            {"id": "gpt-4o-mini", "name": "GPT-4o Mini", "provider": "OpenAI"},
-            {"id": "gpt-4-turbo", "name": "GPT-4 Turbo", "provider": "OpenAI"},
-            {"id": "gemini-1.5-pro", "name": "Gemini 1.5 Pro", "provider": "Google"},
-            {"id": "gemini-1.5-flash", "name": "Gemini 1.5 Flash", "provider": "Google"},
-            {"id": "deepseek/deepseek-chat", "name": "DeepSeek Chat", "provider": "DeepSeek"},
-            {"id": "deepseek/deepseek-reasoner", "name": "DeepSeek Reasoner", "provider": "DeepSeek"}
-        ]
+        "id": researcher.get("id"),
+        "name": f"{researcher.get('prenom', '')} {researcher.get('nom', '')}".strip(),
+        "affiliation": researcher.get("affiliation", ""),
+        "orcid_id": researcher.get("orcid_id", ""),
+        "research_areas": researcher.get("domaines_recherche", ""),
+        "keywords": researcher.get("mots_cles_specifiques", "")
     }
 
-# Add endpoints for the assistant page
+
+async def _stream_researchers(client):
+    """Yield assistant-format researchers as NDJSON, one backend page at a time"""
+    params = {"limit": RESEARCHERS_PAGE_SIZE}
+    while True:
+        response = await client.get(RESEARCHERS_PATH, params=params)
+        if response.status_code != 200:
+            # Headers are already sent, so report the failure in-band
+            yield orjson.dumps({"error": f"Failed to fetch researchers from backend: HTTP {response.status_code}"}) + b"\n"
+            return
+        page = orjson.loads(response.content)
+        for researcher in page:
+            yield orjson.dumps(_assistant_researcher(researcher)) + b"\n"
+        if len(page) < RESEARCHERS_PAGE_SIZE:
+            return
+        params["after_id"] = page[-1]["id"]
+
+
 @router.get("/researchers")
-async def get_researchers_for_assistant():
+async def get_researchers_for_assistant(
+    request: Request,
+    stream: bool = Query(False, description="Stream researchers as NDJSON, paging through the backend")
+):
     """Get researchers for the assistant page"""
     try:
-        # Import here to avoid circular imports
-        import httpx
+        # Call the backend API to get researchers over the app-wide pooled client
+        client = request.app.state.http
         
-        # Call the backend API to get researchers
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://backend-v2:8020/api/v1/chercheurs/")
+        if stream:
+            # Rows are transformed and flushed page by page instead of holding the full list twice
+            return StreamingResponse(_stream_researchers(client), media_type="application/x-ndjson")
+        
+        response = await client.get(RESEARCHERS_PATH)
+        
+        if response.status_code == 200:
+            researchers = response.json()
             
-            if response.status_code == 200:
-                researchers = response.json()
-                
-                # Transform to the format expected by the assistant
-                transformed_researchers = []
-                for researcher in researchers:
-                    transformed_researchers.append({
-                        "id": researcher.get("id"),
-                        "name": f"{researcher.get('prenom', '')} {researcher.get('nom', '')}".strip(),
-                        "affiliation": researcher.get("affiliation", ""),
-                        "orcid_id": researcher.get("orcid_id", ""),
-                        "research_areas": researcher.get("domaines_recherche", ""),
-                        "keywords": researcher.get("mots_cles_specifiques", "")
-                    })
-                
-                return {
-                    "researchers": transformed_researchers,
-                    "total": len(transformed_researchers)
-                }
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to fetch researchers from backend"
-                )
+            # Transform to the format expected by the assistant
+            transformed_researchers = [_assistant_researcher(researcher) for researcher in researchers]
+            
+            return {
+                "researchers": transformed_researchers,
+                "total": len(transformed_researchers)
+            }
+        else:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Failed to fetch researchers from backend"
+            )
                 
     except Exception as e:
-        print(f"Error fetching researchers: {e}")
+        logger.error("Error fetching researchers: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch researchers: {str(e)}"
         )
 
 @router.post("/researchers/report")
-async def generate_researchers_report():
+async def generate_researchers_report(request: Request):
     """Generate a researchers report"""
     try:
-        researchers_response = await get_researchers_for_assistant()
+        researchers_response = await get_researchers_for_assistant(request, stream=False)
         researchers = researchers_response.get("researchers", [])
         
+        # Single pass over the researchers for every aggregate
+        total = 0
+        with_orcid = 0
+        institutions: set = set()
+        for r in researchers:
+            total += 1
+            if r.get("orcid_id"):
+                with_orcid += 1
+            affiliation = r.get("affiliation")
+            if affiliation:
+                institutions.add(affiliation)
+        
         report = {
             "metadata": {
-                "total_researchers": len(researchers),
-                "researchers_with_orcid": len([r for r in researchers if r.get("orcid_id")]),
+                "total_researchers": total,
+                "researchers_with_orcid": with_orcid,
                 "total_works": 0,  # Placeholder
-                "generated_at": "2025-09-23"
+                "generated_at": datetime.now().isoformat()
             },
             "summary": {
-                "institutions": list(set(r.get("affiliation", "Unknown") for r in researchers if r.get("affiliation")))[:10]
+                "institutions": list(itertools.islice(institutions, 10))
             },
             "researchers": researchers
         }
@@ -263,10 +572,17 @@ async def generate_researchers_report():
         return {"success": True, "report": report}
         
     except Exception as e:
-        print(f"Error generating report: {e}")
+        logger.error("Error generating report: %s", e)
         return {"success": False, "error": str(e)}
 
 @router.post("/chat/clear")
 async def clear_chat_history():
     """Clear chat history"""
-    return {"message": "Chat history cleared"}
\ No newline at end of file
+    return {"message": "Chat history cleared"}
+
+@router.post("/chat/cache/clear")
+async def clear_chat_cache():
+    """Drop all cached chat responses"""
+    cleared = len(_chat_cache)
+    _chat_cache.clear()
+    return {"message": "Chat cache cleared", "entries_cleared": cleared}
\ No newline at end of file
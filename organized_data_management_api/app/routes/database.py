@@ -2,18 +2,23 @@
 Database-related API endpoints
 """
 
+import asyncio
+import logging
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 from typing import Dict, List, Any
 
 from ..models.database import DatabaseConnectionRequest, SimpleDatabaseCreate, TableSelectionRequest
 from ..services.mcp_service import (
-    call_mcp_add_db, call_mcp_list_dbs, call_mcp_schema_by_type, 
+    call_mcp_add_db, cached_list_dbs, invalidate_list_dbs_cache, call_mcp_schema_by_type, 
     call_mcp_get_dbtype, call_mcp_select_data, call_mcp_remove_db
 )
 from ..utils.helpers import list_mcp_tools, get_schema_fallback
 
-router = APIRouter(prefix="/api/databases", tags=["databases"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/databases", tags=["databases"], default_response_class=ORJSONResponse)
 
 
 @router.post("")
@@ -44,6 +49,7 @@ async def create_database_api(db_config: DatabaseConnectionRequest):
 
         # Call MCP server to add the database
         mcp_result = await call_mcp_add_db(simple_db_config)
+        invalidate_list_dbs_cache()
 
         if not mcp_result["success"]:
             raise HTTPException(
@@ -82,10 +88,10 @@ async def get_databases_api():
     """Get all database connections (API endpoint for frontend)"""
     try:
         # Get databases from MCP server using the new YAML-based server
-        mcp_result = await call_mcp_list_dbs()
+        mcp_result = await cached_list_dbs()
         
         if not mcp_result.get("success"):
-            print(f"Failed to get databases from MCP server: {mcp_result.get('error')}")
+            logger.warning("Failed to get databases from MCP server: %s", mcp_result.get('error'))
             return []
         
         db_result = mcp_result.get("data", [])
@@ -108,14 +114,14 @@ async def get_databases_api():
                 }
                 databases.append(database)
             else:
-                print(f"Skipping invalid database entry: {db}")
+                logger.debug("Skipping invalid database entry: %s", db)
                 continue
 
-        print(f"Found {len(databases)} databases: {databases}")
+        logger.debug("Found %d databases: %s", len(databases), databases)
         return databases
 
     except Exception as e:
-        print(f"Error getting databases: {str(e)}")
+        logger.error("Error getting databases: %s", e)
         # Return empty list on error to prevent frontend crashes
         return []
 
@@ -127,37 +133,37 @@ async def get_database_schema_api(db_id: int):
         # Convert db_id to string for MCP call
         mcp_db_id = str(db_id)
         
-        print(f"Getting schema for database {db_id} (MCP ID: {mcp_db_id})")
+        logger.debug("Getting schema for database %s (MCP ID: %s)", db_id, mcp_db_id)
         
         # First get the database type
         db_type_result = await call_mcp_get_dbtype(mcp_db_id)
         
         if not db_type_result["success"]:
-            print(f"Failed to get database type: {db_type_result['error']}")
+            logger.warning("Failed to get database type: %s", db_type_result['error'])
             # Try to get schema anyway with default type
             db_type = "postgres"  # Default fallback
         else:
             db_type = db_type_result["dbtype"]
-            print(f"Database type: {db_type}")
+            logger.debug("Database type: %s", db_type)
         
         # List available tools for debugging
-        print("Listing available MCP tools...")
+        logger.debug("Listing available MCP tools...")
         available_tools = list_mcp_tools()
         tool_names = [tool.get('name', 'unknown') for tool in available_tools]
-        print(f"Available tools: {tool_names}")
+        logger.debug("Available tools: %s", tool_names)
 
         # Use the type-specific schema introspection function
         schema_result = await call_mcp_schema_by_type(mcp_db_id, db_type)
 
         if not schema_result["success"]:
-            print(f"Schema retrieval failed: {schema_result['error']}")
+            logger.warning("Schema retrieval failed: %s", schema_result['error'])
             
             # Try fallback method
-            print("Trying fallback schema method...")
+            logger.debug("Trying fallback schema method...")
             fallback_result = await get_schema_fallback(mcp_db_id, db_type)
             
             if fallback_result["success"]:
-                print("Fallback schema method succeeded!")
+                logger.debug("Fallback schema method succeeded")
                 return {
                     "db_id": db_id,
                     "schema": fallback_result["data"],
@@ -190,7 +196,7 @@ async def get_database_schema_api(db_id: int):
         }
 
     except Exception as e:
-        print(f"Error getting database schema: {str(e)}")
+        logger.error("Error getting database schema: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get database schema: {str(e)}"
@@ -201,11 +207,20 @@ async def get_database_schema_api(db_id: int):
 async def select_table_data(request: TableSelectionRequest):
     """Select data from a database table"""
     try:
-        # First, check if the database exists by calling the MCP server directly
-        # instead of relying on local simple_databases dictionary
-        
-        # Get databases from MCP server to validate the database exists
-        mcp_databases_result = await call_mcp_list_dbs()
+        # Validate against the MCP server's database list (not the local simple_databases
+        # dictionary) while the select runs concurrently; the select result is only used
+        # once the database is known to exist
+        mcp_databases_result, mcp_result = await asyncio.gather(
+            cached_list_dbs(),
+            call_mcp_select_data(
+                db_id=request.db_id,
+                table=request.table_name,
+                columns=request.columns,
+                conditions=request.conditions or {},
+                # One extra row tells whether the table had more than the limit
+                limit=request.limit + 1 if request.limit else None
+            )
+        )
         
         if not mcp_databases_result.get("success"):
             raise HTTPException(
@@ -214,45 +229,24 @@ async def select_table_data(request: TableSelectionRequest):
             )
         
         # Check if the requested database exists
-        db_id_to_check = request.db_id
-        if isinstance(db_id_to_check, str) and db_id_to_check.isdigit():
-            db_id_to_check = int(db_id_to_check)
-        
-        databases = mcp_databases_result.get("data", [])
-        db_exists = False
-        
-        for db in databases:
-            if isinstance(db, dict):
-                db_id = db.get("id")
-                if isinstance(db_id, str) and db_id.isdigit():
-                    db_id = int(db_id)
-                if db_id == db_id_to_check:
-                    db_exists = True
-                    break
-        
-        if not db_exists:
+        by_id = mcp_databases_result["by_id"]
+        if str(request.db_id) not in by_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Database connection '{request.db_id}' not found. Available databases: {[db.get('id', 'unknown') for db in databases]}"
+                detail=f"Database connection '{request.db_id}' not found. Available databases: {list(by_id)}"
             )
         
-        # Use the MCP server to select data from the table
-        mcp_result = await call_mcp_select_data(
-            db_id=request.db_id,
-            table=request.table_name,
-            columns=request.columns,
-            conditions=request.conditions or {}
-        )
-        
         if not mcp_result["success"]:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to select data: {mcp_result['error']}"
             )
         
-        # Limit the results if specified
+        # The MCP server already applied the LIMIT; slicing also drops the probe row
         rows = mcp_result["data"]
+        has_more = False
         if request.limit and request.limit > 0:
+            has_more = len(rows) > request.limit
             rows = rows[:request.limit]
         
         return {
@@ -261,8 +255,8 @@ async def select_table_data(request: TableSelectionRequest):
             "columns": request.columns,
             "conditions": request.conditions,
             "rows": rows,
-            "total_rows": len(mcp_result["data"]),
-            "returned_rows": len(rows)
+            "returned_rows": len(rows),
+            "has_more": has_more
         }
 
     except HTTPException:
@@ -280,6 +274,7 @@ async def delete_database_api(db_id: int):
     try:
         # Call MCP server to remove the database
         result = await call_mcp_remove_db(str(db_id))
+        invalidate_list_dbs_cache()
         
         if not result["success"]:
             error_msg = result.get('error', 'Unknown error')
@@ -314,7 +309,7 @@ async def test_database_connection_api(db_id: int):
     """Test database connection"""
     try:
         # Get database info to test connection
-        mcp_result = await call_mcp_list_dbs()
+        mcp_result = await cached_list_dbs()
         
         if not mcp_result["success"]:
             raise HTTPException(
@@ -322,14 +317,7 @@ async def test_database_connection_api(db_id: int):
                 detail=f"Failed to get database info: {mcp_result['error']}"
             )
         
-        # Find the database with matching ID
-        db_found = False
-        for db in mcp_result["data"]:
-            if str(db.get("id")) == str(db_id):
-                db_found = True
-                break
-        
-        if not db_found:
+        if str(db_id) not in mcp_result["by_id"]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Database with id {db_id} not found"
@@ -3,8 +3,10 @@ MCP (Model Context Protocol) service functions
 """
 
 import json
+import time
 import requests
 import asyncio
+import httpx
 import traceback
 from typing import Dict, List, Optional, Any
 from ..models.database import SimpleDatabaseCreate, SimpleDatabaseResponse
@@ -18,6 +20,33 @@ import os
 DB_MCP_URL = os.getenv("MCP_DB_SERVER_URL", "http://localhost:8017/mcp")  # Multi-DB MCP server
 ORCID_MCP_URL = os.getenv("MCP_ORCID_SERVER_URL", "http://localhost:8001/mcp")  # ORCID MCP server
 
+# Last successful list_dbs result; the registry only changes through add/remove, which invalidate it
+LIST_DBS_CACHE_TTL = float(os.getenv("MCP_LIST_DBS_CACHE_TTL", "10"))
+_list_dbs_cache: Dict[str, Any] = {"at": 0.0, "data": None}
+_list_dbs_lock = asyncio.Lock()
+
+# One long-lived client for the async call_mcp_* helpers, so calls reuse pooled keep-alive
+# connections to the MCP server instead of opening one per request; created on first use
+_mcp_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_mcp_client() -> httpx.AsyncClient:
+    global _mcp_client
+    if _mcp_client is None:
+        _mcp_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(10.0)
+        )
+    return _mcp_client
+
+
+async def close_mcp_client():
+    """Close the shared MCP client (application shutdown)"""
+    global _mcp_client
+    if _mcp_client is not None:
+        await _mcp_client.aclose()
+        _mcp_client = None
+
 
 def extract_json_from_sse(text):
     """Extract JSON from Server-Sent Events text"""
@@ -129,7 +158,7 @@ async def call_mcp_add_db(db_config: SimpleDatabaseCreate) -> dict:
             "Accept": "application/json, text/event-stream"
         }
         
-        response = requests.post(mcp_url, json=mcp_message, headers=headers, timeout=10)
+        response = await _get_mcp_client().post(mcp_url, json=mcp_message, headers=headers)
         response.encoding = 'utf-8'
         
         if response.status_code == 200:
@@ -186,7 +215,7 @@ async def call_mcp_list_dbs() -> dict:
             "Accept": "application/json, text/event-stream"
         }
 
-        response = requests.post(mcp_url, json=mcp_message, headers=headers, timeout=10)
+        response = await _get_mcp_client().post(mcp_url, json=mcp_message, headers=headers)
         response.encoding = 'utf-8'  # Ensure correct decoding of Unicode characters
 
         if response.status_code == 200:
@@ -257,6 +286,33 @@ async def call_mcp_list_dbs() -> dict:
         return {"success": False, "error": f"Failed to connect to MCP server: {str(e)}"}
 
 
+async def cached_list_dbs(ttl: float = LIST_DBS_CACHE_TTL) -> dict:
+    """call_mcp_list_dbs() behind a short TTL cache; failed calls are not cached.
+    
+    Successful results also carry "by_id": the database entries keyed by str(id)."""
+    def fresh():
+        return _list_dbs_cache["data"] is not None and time.monotonic() - _list_dbs_cache["at"] < ttl
+
+    if fresh():
+        return _list_dbs_cache["data"]
+    # Concurrent misses wait for a single MCP call instead of each issuing one
+    async with _list_dbs_lock:
+        if fresh():
+            return _list_dbs_cache["data"]
+        result = await call_mcp_list_dbs()
+        if result.get("success"):
+            result["by_id"] = {
+                str(db["id"]): db for db in result.get("data") or [] if isinstance(db, dict) and "id" in db
+            }
+            _list_dbs_cache.update(at=time.monotonic(), data=result)
+        return result
+
+
+def invalidate_list_dbs_cache():
+    """Force the next cached_list_dbs() call to hit the MCP server"""
+    _list_dbs_cache["data"] = None
+
+
 async def call_mcp_schema_by_type(db_id: str, db_type: str) -> dict:
     """Call the appropriate MCP schema tool based on database type using the exact pattern from data.py"""
     try:
@@ -360,8 +416,10 @@ async def call_mcp_schema_by_type(db_id: str, db_type: str) -> dict:
         return {"success": False, "error": f"Failed to get schema: {str(e)}"}
 
 
-async def call_mcp_select_data(db_id: str, table: str, columns: List[str], conditions: Dict[str, str] = {}) -> dict:
-    """Call the multi_db_mcp server to select data from a table using enhanced patterns from data.py"""
+async def call_mcp_select_data(db_id: str, table: str, columns: List[str], conditions: Dict[str, str] = {}, limit: Optional[int] = None) -> dict:
+    """Call the multi_db_mcp server to select data from a table using enhanced patterns from data.py.
+    
+    With `limit`, the LIMIT is applied by the database so only that many rows are transferred."""
     try:
         mcp_url = DB_MCP_URL
 
@@ -385,13 +443,15 @@ async def call_mcp_select_data(db_id: str, table: str, columns: List[str], condi
                 }
             }
         }
+        if limit is not None:
+            mcp_message["params"]["arguments"]["limit"] = limit
 
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream"
         }
 
-        response = requests.post(mcp_url, json=mcp_message, headers=headers, timeout=15)
+        response = await _get_mcp_client().post(mcp_url, json=mcp_message, headers=headers, timeout=15)
         response.encoding = 'utf-8'  # Ensure correct decoding of Unicode characters
         
         if response.status_code == 200:
@@ -483,7 +543,7 @@ async def call_mcp_remove_db(db_id: str) -> dict:
             "Accept": "application/json, text/event-stream"
         }
         
-        response = requests.post(mcp_url, json=mcp_message, headers=headers, timeout=10)
+        response = await _get_mcp_client().post(mcp_url, json=mcp_message, headers=headers)
         response.encoding = 'utf-8'
         
         if response.status_code == 200:
@@ -10,7 +10,7 @@ from ..models.base import TableInfo
 
 
 # === Database Schema Handling ===
-@dataclass
+@dataclass(slots=True)
 class TableInfo:
     name: str
     columns: Dict[str, str]